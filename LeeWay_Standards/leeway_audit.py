@@ -8,21 +8,38 @@ HOW=python tools/leeway_backend_audit_plus.py [--strict] [--report-html]
 SPDX-License-Identifier: MIT
 """
 
-import argparse, json, os, re, sys, shutil
+import argparse, glob, json, os, re, sys, shutil, time
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from html import escape
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from leeway_checkpoints import MANIFEST_NAME, VERIFY_CACHE_NAME, verify_manifest, write_manifest
+from leeway_git import ChangeSet, GitError, changed_files
+import leeway_header_fix as header_fix
+from leeway_headers import (
+    DEFAULT_MAX_FILE_BYTES, DEFAULT_MAX_HEADER_LINES, HEADER_RE, MAX_FILE_BYTES_HELP, MAX_HEADER_LINES_HELP,
+    oversize_reason, probe_header,
+)
+from leeway_metrics import Metrics, write_trace
+import leeway_report_io as report_io
+from leeway_scan_cache import ScanCache, cache_signature, fingerprint
+from leeway_walk import IgnoreMatcher, Inventory, load_ignore_patterns
 
 # ---------- Roots (repo-relative; override via env) ----------
 REPO_ROOT = Path(os.getenv("GITHUB_WORKSPACE") or os.getcwd()).resolve()
 ENV_ROOT = os.getenv("LW_BACKEND_ROOT")
 DEFAULT_ROOT = (REPO_ROOT / (ENV_ROOT or "backend")).resolve()
 DEFAULT_JSON = (DEFAULT_ROOT / "run" / "leeway_audit_report.json").resolve()
+CACHE_NAME = "leeway_audit_scan_cache.json"  # lives in <root>/run/
 
 # If you want this script to emit the combined HTML report (optional)
 DEFAULT_FE_JSON = (REPO_ROOT / (os.getenv("LW_FRONTEND_ROOT") or "frontend") / "run" / "leeway_frontend_audit_report.json").resolve()
 DEFAULT_HTML = (DEFAULT_ROOT / "run" / "leeway_audit_report.html").resolve()
 
-HEADER_RE = re.compile(r"LEEWAY HEADER|LEEWAY MICRO:", re.M)
+HEADER_EXTS = [".py",".ps1",".psm1",".mjs",".js",".ts",".md",".surql"]
 
 # Use portable, POSIX-like rel paths; join via Path(..., *rel.split("/"))
 REQUIRED_DIRS = [
@@ -38,6 +55,12 @@ REQUIRED_PY_PKGS = [
     "websockets","soundfile","scipy","numpy","ffmpeg-python","jieba",
 ]
 
+# gitignore semantics. Model trees are pruned: check_models only needs models/'s own entries
+DEFAULT_IGNORES = [
+    ".git/", "node_modules/", "__pycache__/", ".venv/", "venv/",
+    ".mypy_cache/", ".pytest_cache/", "/models/*/",
+]
+
 CHECKPOINT_LAYOUT = {
     "converter": ["checkpoint.pth","config.json"],
     "EN": ["checkpoint.pth","config.json","en_default_se.pth","en_style_se.pth"],
@@ -58,28 +81,94 @@ def rglob(root: Path, exts: List[str]) -> List[Path]:
             out.append(p)
     return out
 
-def scan_headers_backend(root: Path) -> List[str]:
-    files = rglob(root, [".py",".ps1",".psm1",".mjs",".js",".ts",".md",".surql"])
+def header_cache_signature(max_header_lines: int = DEFAULT_MAX_HEADER_LINES) -> str:
+    return cache_signature(HEADER_RE.pattern, sorted(HEADER_EXTS), max_header_lines, "prefix-fp")
+
+def build_inventory(root: Path, patterns: Optional[List[str]] = None) -> Inventory:
+    """Single pruned walk of the backend root; every check below can answer from it."""
+    return Inventory.build(root, IgnoreMatcher(DEFAULT_IGNORES if patterns is None else patterns))
+
+PROBE_CHUNK = 256  # files per pool task when a shared pool is supplied
+
+def _probe_chunk(paths: List[str], max_header_lines: int) -> List[Tuple[str, str, int, float]]:
+    # Top-level so a ProcessPoolExecutor can pickle it. -> [(status, prefix fingerprint, bytes read, seconds)]
+    out: List[Tuple[str, str, int, float]] = []
+    for path in paths:
+        t0 = time.perf_counter()
+        try: status, consumed = probe_header(Path(path), max_header_lines)
+        except Exception: out.append(("error", "", 0, time.perf_counter() - t0)); continue
+        out.append((status, fingerprint(consumed), len(consumed), time.perf_counter() - t0))
+    return out
+
+def scan_headers_backend(root: Path, cache: Optional[ScanCache] = None,
+                         max_header_lines: int = DEFAULT_MAX_HEADER_LINES,
+                         max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                         inv: Optional[Inventory] = None,
+                         pool: Optional[Executor] = None,
+                         metrics: Optional[Metrics] = None,
+                         files: Optional[List[Path]] = None) -> Tuple[List[str], Dict[str, str]]:
+    """
+    -> (headers_missing, skipped {path: reason}).
+    Only the header prefix is read (streamed, stops at first match); oversized files are not opened
+    and binary files are not decoded. The cache fingerprint covers just the bytes the verdict used.
+    Cache misses are probed on `pool` when given, otherwise inline. `files` overrides the walk
+    (already filtered, e.g. a git diff).
+    """
+    if files is None: files = inv.files_with_ext(HEADER_EXTS) if inv else rglob(root, HEADER_EXTS)
+    cache = cache or ScanCache(None, "")
     missing: List[str] = []
+    skipped: Dict[str, str] = {}
+    pending: List[Tuple[str, os.stat_result]] = []
     for f in files:
-        try: text = f.read_text(encoding="utf-8", errors="ignore")
-        except Exception: missing.append(str(f)); continue
-        if not HEADER_RE.search(text):
-            missing.append(str(f))
-    return sorted(missing)
+        key = str(f)
+        try: st = f.stat()
+        except OSError: missing.append(key); continue
+        reason = oversize_reason(st.st_size, max_file_bytes)
+        if reason: skipped[key] = reason; continue
+        hit = cache.lookup(key, st)
+        if hit is None: pending.append((key, st))
+        elif not hit["header"]: missing.append(key)
+
+    probe = partial(_probe_chunk, max_header_lines=max_header_lines)
+    keys = [k for k, _ in pending]
+    if pool is not None and len(keys) > PROBE_CHUNK:
+        chunks = [keys[i:i + PROBE_CHUNK] for i in range(0, len(keys), PROBE_CHUNK)]
+        results = [r for batch in pool.map(probe, chunks) for r in batch]
+    else:
+        results = probe(keys)
+    if metrics:
+        metrics.count("files_scanned", len(pending))
+        metrics.count("cache_hits", len(files) - len(pending) - len(skipped))
+        for (key, _), (_, _, nbytes, secs) in zip(pending, results):
+            metrics.count("bytes_read", nbytes)
+            metrics.add_worker_time("header_probe", secs)
+            metrics.file_time(key, secs)
+    for (key, st), (status, fp, _, _) in zip(pending, results):
+        if status == "error": missing.append(key); continue
+        if status == "binary": skipped[key] = "binary"; continue
+        prior = cache.prior(key)
+        hit = prior["result"] if prior and prior.get("fp") == fp else {"header": status == "present"}
+        cache.store(key, st.st_size, st.st_mtime_ns, fp, hit)
+        if not hit["header"]:
+            missing.append(key)
+    cache.save()
+    return sorted(missing), skipped
 
-def check_dirs(root: Path) -> Dict[str, bool]:
+def check_dirs(root: Path, inv: Optional[Inventory] = None) -> Dict[str, bool]:
     res: Dict[str, bool] = {}
     for rel in REQUIRED_DIRS:
-        res[rel] = (root / Path(*rel.split("/"))).exists()
+        res[rel] = inv.exists(rel) if inv else (root / Path(*rel.split("/"))).exists()
     return res
 
-def check_models(root: Path):
-    models = root / "models"
-    present: List[str] = []
-    try: present = [str(n) for n in models.iterdir()]
-    except Exception: present = []
-    base = [Path(p).name for p in present]
+def check_models(root: Path, inv: Optional[Inventory] = None):
+    if inv is not None:
+        base = inv.listdir("models") or []
+    else:
+        models = root / "models"
+        present: List[str] = []
+        try: present = [str(n) for n in models.iterdir()]
+        except Exception: present = []
+        base = [Path(p).name for p in present]
     flags = {
         "azr": any("Absolute_Zero_Reasoner" in n for n in base),
         "phi3": any("phi3" in n.lower() for n in base),
@@ -89,17 +178,22 @@ def check_models(root: Path):
     }
     return {"present": base, "flags": flags}
 
-def check_checkpoints(root: Path) -> Dict[str, Dict[str, bool]]:
+def check_checkpoints(root: Path, inv: Optional[Inventory] = None) -> Dict[str, Dict[str, bool]]:
     base = root / "checkpoints"
     found: Dict[str, Dict[str, bool]] = {}
     for key, files in CHECKPOINT_LAYOUT.items():
-        dirp = base / ("converter" if key == "converter" else Path("base_speakers") / key)
+        sub = "converter" if key == "converter" else f"base_speakers/{key}"
+        dirp = base / Path(*sub.split("/"))
         res: Dict[str, bool] = {}
         for f in files:
-            res[f] = (dirp / f).exists()
+            res[f] = inv.exists(f"checkpoints/{sub}/{f}") if inv else (dirp / f).exists()
         found[key] = res
     return found
 
+def checkpoint_rels() -> List[str]:
+    # CHECKPOINT_LAYOUT as paths relative to <root>/checkpoints
+    return [f"{'converter' if k == 'converter' else 'base_speakers/' + k}/{f}" for k, files in CHECKPOINT_LAYOUT.items() for f in files]
+
 def check_requirements(root: Path):
     req = root / "requirements.txt"
     try: text = req.read_text(encoding="utf-8", errors="ignore")
@@ -120,42 +214,147 @@ def summarize_failures(rept: dict, ignore_ffmpeg: bool) -> List[str]:
     for k, d in (rept.get("checkpoints") or {}).items():
         need = [f for f, ok in d.items() if not ok]
         if need: fails.append(f"[backend] checkpoints:{k} missing {', '.join(need)}")
+    integ = rept.get("checkpoint_integrity")
+    if integ and integ.get("error"): fails.append(f"[backend] checkpoints integrity: {integ['error']}")
+    for rel, status in ((integ or {}).get("files") or {}).items():
+        if status != "ok": fails.append(f"[backend] checkpoints integrity: {rel} {status}")
     if not ignore_ffmpeg and (rept.get("ffmpeg_available") is False):
         fails.append("[backend] ffmpeg not available")
     return fails
 
+# --strict category -> failure-message prefix produced by summarize_failures
+STRICT_PREFIXES = {
+    "headers": "[backend] missing headers",
+    "dirs": "[backend] missing dirs",
+    "requirements": "[backend] missing py pkgs",
+    "checkpoints": "[backend] checkpoints",
+    "ffmpeg": "[backend] ffmpeg",
+}
+
+def strict_failures(rept: dict, strict: str, ignore_ffmpeg: bool) -> List[str]:
+    if not strict: return []
+    fails = summarize_failures(rept, ignore_ffmpeg=ignore_ffmpeg)
+    if strict == "all": return fails
+    return [f for f in fails if f.startswith(STRICT_PREFIXES.get(strict, f"[backend] {strict}"))]
+
+def scoped_header_files(root: Path, changes: ChangeSet, patterns: List[str]) -> List[Path]:
+    matcher = IgnoreMatcher(patterns)
+    exts = {e.lower() for e in HEADER_EXTS}
+    return [f.path for f in changes.under(root)
+            if f.path.suffix.lower() in exts and not matcher.ignored_path(f.path.relative_to(root).as_posix())]
+
+def audit_backend(
+    root: Path,
+    patterns: List[str],
+    use_cache: bool = True,
+    max_header_lines: int = DEFAULT_MAX_HEADER_LINES,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    verify_checkpoints: bool = False,
+    manifest: Optional[Path] = None,
+    hash_workers: int = 1,
+    pool: Optional[Executor] = None,
+    config: Optional[Dict[str, str]] = None,
+    metrics: Optional[Metrics] = None,
+    changes: Optional[ChangeSet] = None,
+    repo_checks: bool = True,
+) -> dict:
+    """
+    One inventory walk, every backend check, no output. Phase timings/counters go to rept["metrics"].
+    With `changes` only changed files are header-checked and there is no walk; the repository-wide
+    checks (dirs/models/checkpoints/requirements/ffmpeg) run only if `repo_checks`, else their keys are absent.
+    """
+    metrics = metrics or Metrics("backend")
+    scoped = changes is not None
+    inv: Optional[Inventory] = None
+    with metrics.phase("walk"):
+        if scoped: files = scoped_header_files(root, changes, patterns)
+        if not scoped or repo_checks: inv = build_inventory(root, patterns)
+    if inv is not None:
+        for k, v in inv.stats().items(): metrics.count(k, v)
+    with metrics.phase("cache_load"):
+        cache = ScanCache.load(root / "run" / CACHE_NAME if use_cache else None, header_cache_signature(max_header_lines),
+                               prune=not scoped)
+    with metrics.phase("headers"):
+        headers_missing, skipped = scan_headers_backend(root, cache, max_header_lines, max_file_bytes, inv, pool, metrics,
+                                                        files if scoped else None)
+    rept = {"root": str(root)}
+    if not scoped or repo_checks:
+        with metrics.phase("dirs"): rept["dirs"] = check_dirs(root, inv)
+    rept["headers_missing"] = headers_missing
+    rept["skipped_files"] = skipped
+    if not scoped or repo_checks:
+        with metrics.phase("models"): rept["models"] = check_models(root, inv)
+        with metrics.phase("checkpoints"): rept["checkpoints"] = check_checkpoints(root, inv)
+        with metrics.phase("requirements"): rept["requirements"] = check_requirements(root)
+        with metrics.phase("ffmpeg"): rept["ffmpeg_available"] = have_ffmpeg()
+    rept["config"] = {
+        **(config or {}),
+        "cache": str(cache.path) if cache.enabled else "off",
+        "max_header_lines": str(max_header_lines), "max_file_bytes": str(max_file_bytes),
+    }
+    if scoped:
+        rept["config"].update({"changed_since": changes.ref, "changed_base": changes.base,
+                               "changed_files": str(len(files)), "repo_checks": str(repo_checks).lower()})
+    if verify_checkpoints:
+        ckpt_dir = root / "checkpoints"
+        with metrics.phase("verify_checkpoints"):
+            rept["checkpoint_integrity"] = verify_manifest(
+                ckpt_dir, manifest or ckpt_dir / MANIFEST_NAME, hash_workers,
+                root / "run" / VERIFY_CACHE_NAME if use_cache else None)
+        metrics.count("checkpoints_hashed", rept["checkpoint_integrity"].get("hashed", 0))
+    rept["metrics"] = metrics.to_dict()
+    return rept
+
+def fix_report_headers(root: Path, rept: dict, template: "header_fix.HeaderTemplate", dry_run: bool,
+                       metrics: Metrics, workers: int = os.cpu_count() or 4, pool: Optional[Executor] = None,
+                       max_header_lines: int = DEFAULT_MAX_HEADER_LINES) -> List["header_fix.HeaderFix"]:
+    """Backend twin of the frontend's fix_report_headers(): rept["headers_missing"] in, rept["header_fixes"] out."""
+    with metrics.phase("fix_headers"):
+        fixes = header_fix.fix_headers(root, rept["headers_missing"], template, dry_run, workers, pool, max_header_lines)
+    rept["header_fixes"] = header_fix.outcomes(fixes)
+    rept["headers_missing"] = [p for p in rept["headers_missing"] if rept["header_fixes"].get(p) != "fixed"]
+    rept["metrics"] = metrics.to_dict()
+    if dry_run: header_fix.write_diff(root / "run" / header_fix.DIFF_NAME, fixes)
+    return fixes
+
 def write_json(fp: Path, obj: dict):
-    fp.parent.mkdir(parents=True, exist_ok=True)
-    fp.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+    report_io.write_json(fp, obj)
 
-def write_html(out_html: Path, fe_json: Path, be_json: Path):
-    # Minimal HTML report (same look/feel as Node)
-    def _safe_list(items: List[str]) -> str:
-        return "<ul>" + "".join(f"<li>{x}</li>" for x in items) + "</ul>" if items else "<p>None ✅</p>"
+def iter_findings(rept: dict) -> Iterator[dict]:
+    """One flat record per backend finding, for NDJSON consumers."""
+    for path in rept.get("headers_missing") or []:
+        yield {"audit": "backend", "check": "header", "path": path}
+    for path, reason in (rept.get("skipped_files") or {}).items():
+        yield {"audit": "backend", "check": "skipped", "path": path, "reason": reason}
+    for rel, ok in (rept.get("dirs") or {}).items():
+        if not ok: yield {"audit": "backend", "check": "dir", "path": rel}
+    for pkg in (rept.get("requirements") or {}).get("missing", []):
+        yield {"audit": "backend", "check": "requirement", "package": pkg}
+    for model, d in (rept.get("checkpoints") or {}).items():
+        for rel, ok in d.items():
+            if not ok: yield {"audit": "backend", "check": "checkpoint", "model": model, "path": rel}
+    for rel, status in ((rept.get("checkpoint_integrity") or {}).get("files") or {}).items():
+        if status != "ok": yield {"audit": "backend", "check": "checkpoint_integrity", "path": rel, "status": status}
+    if rept.get("ffmpeg_available") is False:
+        yield {"audit": "backend", "check": "ffmpeg"}
+
+def summary_line(rept: dict) -> str:
+    return (f"leeway backend: headers_missing={len(rept.get('headers_missing') or [])} "
+            f"missing_dirs={sum(1 for ok in (rept.get('dirs') or {}).values() if not ok)} "
+            f"missing_pkgs={len((rept.get('requirements') or {}).get('missing', []))} "
+            f"skipped={len(rept.get('skipped_files') or {})} ffmpeg={rept.get('ffmpeg_available')}")
 
+def write_html(out_html: Path, fe_json: Path, be_json: Path):
     try: f = json.loads(fe_json.read_text(encoding="utf-8"))
     except Exception: f = None
     try: b = json.loads(be_json.read_text(encoding="utf-8"))
     except Exception: b = None
+    write_html_reports(out_html, f, b)
 
-    def _kv_missing(d: Dict[str, bool]): return [k for k, ok in (d or {}).items() if not ok]
-
-    fe_missing_hdrs = (f or {}).get("headers_missing", [])
-    fe_dup_files = list(((f or {}).get("duplicate_ids") or {}).keys())
-    fe_missing_req = _kv_missing((f or {}).get("required_assets") or {})
-    fe_missing_disc = _kv_missing((f or {}).get("discovered_assets") or {})
+HTML_PAGE_SIZE = 500  # list items rendered inline per section; the rest go to linked overflow pages
 
-    be_missing_hdrs = (b or {}).get("headers_missing", [])
-    be_missing_dirs = [k for k, ok in ((b or {}).get("dirs") or {}).items() if not ok]
-    be_missing_pkgs = ((b or {}).get("requirements") or {}).get("missing", [])
-    be_ff = (b or {}).get("ffmpeg_available") is False
-    be_chk: List[str] = []
-    for k, d in ((b or {}).get("checkpoints") or {}).items():
-        need = [kk for kk, ok in d.items() if not ok]
-        if need: be_chk.append(f"{k}: {', '.join(need)}")
-
-    html = f"""<!doctype html><html><head><meta charset="utf-8"/>
-<title>LEEWAY Audit Report</title>
+HTML_HEAD = """<!doctype html><html><head><meta charset="utf-8"/>
+<title>{title}</title>
 <style>
 body{{font-family:system-ui,Segoe UI,Roboto,Arial,sans-serif;padding:24px;line-height:1.5}}
 h1{{margin:0 0 8px}} h2{{margin-top:24px;border-bottom:1px solid #eee;padding-bottom:4px}}
@@ -163,30 +362,88 @@ h3{{margin-top:16px}} .grid{{display:grid;grid-template-columns:repeat(2,minmax(
 .ok{{color:#16a34a}} .bad{{color:#dc2626}} .pill{{display:inline-block;border:1px solid #e5e7eb;border-radius:999px;padding:2px 8px;margin:2px 6px 2px 0}}
 .mono{{font-family:ui-monospace,SFMono-Regular,Menlo,Consolas,monospace}}
 </style></head><body>
-<h1>LEEWAY Audit Report</h1><div class="mono">Generated: {__import__('datetime').datetime.utcnow().isoformat()}Z</div>
-
-<h2>Frontend</h2>
-<div class="grid">
-  <div><h3>Missing Headers</h3>{_safe_list(fe_missing_hdrs)}</div>
-  <div><h3>Files with Duplicate IDs</h3>{_safe_list(fe_dup_files)}</div>
-</div>
-<div class="grid">
-  <div><h3>Missing Required Assets</h3>{_safe_list(fe_missing_req)}</div>
-  <div><h3>Missing Discovered Assets</h3>{_safe_list(fe_missing_disc)}</div>
-</div>
-
-<h2>Backend</h2>
-<div class="grid">
-  <div><h3>Missing Headers</h3>{_safe_list(be_missing_hdrs)}</div>
-  <div><h3>Missing Dirs</h3>{_safe_list(be_missing_dirs)}</div>
-</div>
-<div class="grid">
-  <div><h3>Missing Python Packages</h3>{_safe_list(be_missing_pkgs)}</div>
-  <div><h3>Checkpoints Missing</h3>{_safe_list(be_chk)}{"<p class='bad'>FFmpeg: not available</p>" if be_ff else "<p class='ok'>FFmpeg: available</p>"}</div>
-</div>
-</body></html>"""
+"""
+
+def _html_page_name(out_html: Path, slug: str, n: int) -> str:
+    return f"{out_html.stem}.{slug}.{n}{out_html.suffix}"
+
+def _remove_html_pages(out_html: Path, slug: str):
+    """Overflow pages left by an earlier run; they would sit next to the new report looking current."""
+    prefix, suffix = f"{out_html.stem}.{slug}.", out_html.suffix
+    for p in out_html.parent.glob(f"{glob.escape(prefix)}*{glob.escape(suffix)}"):
+        if p.name[len(prefix):len(p.name) - len(suffix)].isdigit(): p.unlink(missing_ok=True)
+
+def _write_html_pages(out_html: Path, slug: str, title: str, items: List[str], page_size: int) -> int:
+    """Overflow pages 2..N for one section, each written item by item; -> number of pages."""
+    pages = max(1, -(-len(items) // page_size))
+    for n in range(2, pages + 1):
+        with open(out_html.parent / _html_page_name(out_html, slug, n), "w", encoding="utf-8") as fh:
+            fh.write(HTML_HEAD.format(title=escape(f"LEEWAY Audit Report: {title} ({n}/{pages})")))
+            fh.write(f"<h1>{escape(title)}</h1><div class=\"mono\">Page {n} of {pages}</div>\n<p>")
+            prev = out_html.name if n == 2 else _html_page_name(out_html, slug, n - 1)
+            fh.write(f"<a href=\"{escape(prev)}\">&larr; prev</a>")
+            if n < pages: fh.write(f" | <a href=\"{escape(_html_page_name(out_html, slug, n + 1))}\">next &rarr;</a>")
+            fh.write("</p><ul>")
+            for x in items[(n - 1) * page_size: n * page_size]: fh.write(f"<li>{escape(x)}</li>")
+            fh.write("</ul></body></html>\n")
+    return pages
+
+def write_html_reports(out_html: Path, f: Optional[dict], b: Optional[dict], page_size: int = HTML_PAGE_SIZE):
+    """
+    Render straight from in-memory FE/BE report dicts (either may be None). Written to the file
+    item by item with every value escaped; a section longer than `page_size` shows its first page
+    inline and links to `<stem>.<section>.<n>.html` pages for the rest.
+    """
+    # Minimal HTML report (same look/feel as Node)
+    def _kv_missing(d: Dict[str, bool]): return [k for k, ok in (d or {}).items() if not ok]
+
+    be_chk: List[str] = []
+    for k, d in ((b or {}).get("checkpoints") or {}).items():
+        need = [kk for kk, ok in d.items() if not ok]
+        if need: be_chk.append(f"{k}: {', '.join(need)}")
+    be_ff = (b or {}).get("ffmpeg_available") is False
+
+    # (heading, [(slug, title, items)]) -- two sections per grid row
+    layout = [
+        ("Frontend", [
+            ("fe-headers", "Missing Headers", (f or {}).get("headers_missing", [])),
+            ("fe-dup-ids", "Files with Duplicate IDs", list(((f or {}).get("duplicate_ids") or {}).keys())),
+            ("fe-required-assets", "Missing Required Assets", _kv_missing((f or {}).get("required_assets") or {})),
+            ("fe-discovered-assets", "Missing Discovered Assets", _kv_missing((f or {}).get("discovered_assets") or {})),
+        ]),
+        ("Backend", [
+            ("be-headers", "Missing Headers", (b or {}).get("headers_missing", [])),
+            ("be-dirs", "Missing Dirs", [k for k, ok in ((b or {}).get("dirs") or {}).items() if not ok]),
+            ("be-packages", "Missing Python Packages", ((b or {}).get("requirements") or {}).get("missing", [])),
+            ("be-checkpoints", "Checkpoints Missing", be_chk),
+        ]),
+    ]
+
     out_html.parent.mkdir(parents=True, exist_ok=True)
-    out_html.write_text(html, encoding="utf-8")
+    for _, sections in layout:
+        for slug, _, _ in sections: _remove_html_pages(out_html, slug)
+    with open(out_html, "w", encoding="utf-8") as fh:
+        fh.write(HTML_HEAD.format(title="LEEWAY Audit Report"))
+        fh.write(f"<h1>LEEWAY Audit Report</h1><div class=\"mono\">Generated: {datetime.utcnow().isoformat()}Z</div>\n")
+        for heading, sections in layout:
+            fh.write(f"\n<h2>{heading}</h2>\n")
+            for i, (slug, title, items) in enumerate(sections):
+                if i % 2 == 0: fh.write("<div class=\"grid\">\n")
+                fh.write(f"  <div><h3>{escape(title)}</h3>")
+                if not items: fh.write("<p>None ✅</p>")
+                else:
+                    fh.write("<ul>")
+                    for x in items[:page_size]: fh.write(f"<li>{escape(x)}</li>")
+                    fh.write("</ul>")
+                    if len(items) > page_size:
+                        pages = _write_html_pages(out_html, slug, title, items, page_size)
+                        fh.write(f"<p class=\"mono\">{len(items)} total &middot; "
+                                 f"<a href=\"{escape(_html_page_name(out_html, slug, 2))}\">next page &rarr;</a> (2..{pages})</p>")
+                if slug == "be-checkpoints":
+                    fh.write("<p class='bad'>FFmpeg: not available</p>" if be_ff else "<p class='ok'>FFmpeg: available</p>")
+                fh.write("</div>\n")
+                if i % 2 == 1: fh.write("</div>\n")
+        fh.write("</body></html>")
     print(f"Wrote {out_html}")
 
 def main():
@@ -199,30 +456,69 @@ def main():
     ap.add_argument("--report-html", action="store_true", help="Also emit combined HTML report (reads FE+BE JSON)")
     ap.add_argument("--fe-json", type=Path, default=DEFAULT_FE_JSON, help="Path to frontend JSON (for HTML)")
     ap.add_argument("--html-out", type=Path, default=DEFAULT_HTML, help="HTML output path (for --report-html)")
+    ap.add_argument("--no-cache", action="store_true", help=f"Ignore and do not write <root>/run/{CACHE_NAME}")
+    ap.add_argument("--max-header-lines", type=int, default=DEFAULT_MAX_HEADER_LINES, help=MAX_HEADER_LINES_HELP)
+    ap.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES, help=MAX_FILE_BYTES_HELP)
+    ap.add_argument("--ignore-file", type=Path, default=None, help="Path to .leewayignore (gitignore syntax; replaces the defaults)")
+    ap.add_argument("--ignore", action="append", default=[], help="Extra ignore glob (repeatable)")
+    ap.add_argument("--verify-checkpoints", action="store_true", help="Check checkpoint sizes + digests against the manifest")
+    ap.add_argument("--write-checkpoint-manifest", action="store_true", help="Hash present CHECKPOINT_LAYOUT files into the manifest")
+    ap.add_argument("--checkpoint-manifest", type=Path, default=None, help=f"Manifest path (default: <root>/checkpoints/{MANIFEST_NAME})")
+    ap.add_argument("--changed-since", metavar="REF", default="",
+                    help="Only header-check files changed since REF (merge-base; working tree + index + untracked, renames followed)")
+    ap.add_argument("--repo-checks", action="store_true",
+                    help="With --changed-since, still run dirs/models/checkpoints/requirements/ffmpeg checks")
+    ap.add_argument("--hash-workers", type=int, default=os.cpu_count() or 4, help="Processes for checkpoint hashing")
+    ap.add_argument("--quiet", action="store_true", help="Summary line only on the console (the JSON report is still written)")
+    ap.add_argument("--ndjson", type=Path, default=None, help="Also write one JSON finding per line to this path")
+    ap.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event file of the audit phases")
+    ap.add_argument("--fix-headers", action="store_true",
+                    help="Insert the LEEWAY header into every file flagged as missing it (atomic, in place)")
+    ap.add_argument("--dry-run", action="store_true",
+                    help=f"With --fix-headers, change nothing; write the diff to <root>/run/{header_fix.DIFF_NAME}")
+    ap.add_argument("--header-template", type=Path, default=None,
+                    help="Standard JSON whose \"header\" section drives --fix-headers (default: system_header_leeway_v11.json)")
     args = ap.parse_args()
 
     root = args.root.resolve()
-    rept = {
-        "root": str(root),
-        "dirs": check_dirs(root),
-        "headers_missing": scan_headers_backend(root),
-        "models": check_models(root),
-        "checkpoints": check_checkpoints(root),
-        "requirements": check_requirements(root),
-        "ffmpeg_available": have_ffmpeg(),
-        "config": {"strict": args.strict or ""},
-    }
+    if args.ignore_file is None:
+        args.ignore.extend(DEFAULT_IGNORES)
+    patterns = load_ignore_patterns(args.ignore_file.resolve() if args.ignore_file else None, args.ignore)
+
+    ckpt_dir = root / "checkpoints"
+    manifest = (args.checkpoint_manifest or ckpt_dir / MANIFEST_NAME).resolve()
+    if args.write_checkpoint_manifest:
+        blob = write_manifest(ckpt_dir, checkpoint_rels(), manifest, args.hash_workers)
+        print(f"Wrote {manifest} ({len(blob['files'])} file(s))")
+
+    try: changes = changed_files(root, args.changed_since) if args.changed_since else None
+    except GitError as e:
+        print(f"--changed-since: {e}", file=sys.stderr); sys.exit(2)
+    try: template = header_fix.HeaderTemplate.load(args.header_template, "backend") if args.fix_headers else None
+    except ValueError as e:
+        print(f"--fix-headers: {e}", file=sys.stderr); sys.exit(2)
+    metrics = Metrics("backend")
+    rept = audit_backend(
+        root, patterns, use_cache=not args.no_cache,
+        max_header_lines=args.max_header_lines, max_file_bytes=args.max_file_bytes,
+        verify_checkpoints=args.verify_checkpoints, manifest=manifest, hash_workers=args.hash_workers,
+        config={"strict": args.strict or "", "ignore_file": str(args.ignore_file) if args.ignore_file else ""},
+        metrics=metrics, changes=changes, repo_checks=args.repo_checks,
+    )
+    if template is not None:
+        fixes = fix_report_headers(root, rept, template, args.dry_run, metrics, max_header_lines=args.max_header_lines)
+        print(header_fix.summary_line(root, fixes, args.dry_run), file=sys.stderr)
 
-    write_json(args.out.resolve(), rept)
-    print(json.dumps(rept, indent=2))
+    with metrics.phase("write"):  # trace only; rept["metrics"] is already captured
+        write_json(args.out.resolve(), rept)
+        if args.ndjson: report_io.write_ndjson(args.ndjson.resolve(), iter_findings(rept))
+    if args.trace: write_trace(args.trace.resolve(), metrics)
+    if args.quiet: print(f"{summary_line(rept)} report={args.out.resolve()}")
+    else: report_io.copy_to_stream(args.out.resolve())
 
     # Strict
     if args.strict:
-        fails = summarize_failures(rept, ignore_ffmpeg=args.no_ffmpeg)
-        # Filter by category if not 'all'
-        if args.strict != "all":
-            cat = args.strict
-            fails = [f for f in fails if f.startswith(f"[backend] {cat}")]
+        fails = strict_failures(rept, args.strict, ignore_ffmpeg=args.no_ffmpeg)
         if fails:
             print("❌ LEEWAY AUDIT FAIL\n" + "\n".join(f" - {x}" for x in fails))
             sys.exit(1)
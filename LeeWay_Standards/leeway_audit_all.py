@@ -0,0 +1,161 @@
+"""
+LEEWAY HEADER
+REGION: AUDIT.COMBINED.V1
+5WH: WHAT=Frontend + backend LeeWay audits concurrently in one process, shared worker pool, one strict gate;
+WHY=no second interpreter, no JSON round-trip for the HTML report, no serial wall-clock; WHO=RapidWebDevelop;
+WHERE=tools/leeway_audit_all.py; WHEN=2025-10-04; HOW=python tools/leeway_audit_all.py [--strict] [--executor process]
+SPDX-License-Identifier: MIT
+"""
+
+import argparse, itertools, os, sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import leeway_audit as be
+import leeway_frontend_audit as fe
+from leeway_git import GitError, changed_files
+import leeway_header_fix as header_fix
+from leeway_headers import DEFAULT_MAX_FILE_BYTES, DEFAULT_MAX_HEADER_LINES, MAX_FILE_BYTES_HELP, MAX_HEADER_LINES_HELP
+from leeway_metrics import Metrics, write_trace
+from leeway_report_io import write_ndjson
+from leeway_walk import load_ignore_patterns
+
+FE_STRICT = {"all": "all", "frontend": "all", "headers": "headers", "ids": "ids", "assets": "assets"}
+BE_STRICT = {"all": "all", "backend": "all", "headers": "headers", "dirs": "dirs",
+             "requirements": "requirements", "checkpoints": "checkpoints", "ffmpeg": "ffmpeg"}
+
+def frontend_failures(report: "fe.Report", strict: str) -> List[str]:
+    """Same categories as fe._strict_failed(), but as messages for the combined gate."""
+    if not strict: return []
+    fails: List[str] = []
+    if strict in ("all", "headers") and report.headers_missing:
+        fails.append(f"[frontend] missing headers: {len(report.headers_missing)}")
+    if strict in ("all", "ids") and report.duplicate_ids:
+        fails.append(f"[frontend] duplicate ids in {len(report.duplicate_ids)} file(s)")
+    cross = sum(1 for _ in fe._cross_file_hits(report))
+    if strict in ("all", "ids") and cross:
+        fails.append(f"[frontend] {cross} id(s) used by more than one file")
+    if strict in ("all", "assets"):
+        miss = sorted({k for d in (report.required_assets, report.discovered_assets) for k, ok in d.items() if not ok})
+        if miss: fails.append(f"[frontend] missing assets: {', '.join(miss[:10])}" + (f" ... (+{len(miss)-10} more)" if len(miss) > 10 else ""))
+    return fails
+
+def main():
+    ap = argparse.ArgumentParser(description="Leeway combined frontend + backend audit (OS-agnostic)")
+    ap.add_argument("--fe-root", type=Path, default=fe.DEFAULT_ROOT, help="frontend root (default: ./frontend or env LW_FRONTEND_ROOT)")
+    ap.add_argument("--be-root", type=Path, default=be.DEFAULT_ROOT, help="backend root (default: ./backend or env LW_BACKEND_ROOT)")
+    ap.add_argument("--fe-out", type=Path, default=None, help="Frontend JSON (default: <fe-root>/run/leeway_frontend_audit_report.json)")
+    ap.add_argument("--be-out", type=Path, default=None, help="Backend JSON (default: <be-root>/run/leeway_audit_report.json)")
+    ap.add_argument("--html-out", type=Path, default=None, help="Combined HTML (default: <be-root>/run/leeway_audit_report.html)")
+    ap.add_argument("--fe-ignore-file", type=Path, default=None, help="Frontend .leewayignore (replaces frontend defaults)")
+    ap.add_argument("--be-ignore-file", type=Path, default=None, help="Backend .leewayignore (replaces backend defaults)")
+    ap.add_argument("--strict", nargs="?", const="all", choices=sorted(set(FE_STRICT) | set(BE_STRICT)),
+                    help="Exit non-zero if selected checks fail: all, frontend, backend, or one category")
+    ap.add_argument("--no-ffmpeg", action="store_true", help="Do not fail on missing ffmpeg")
+    ap.add_argument("--require-image", action="append", default=[], help="Additional required image path (relative to /public)")
+    ap.add_argument("--asset-root", action="append", default=[], help="Extra frontend asset dir searched after public/")
+    ap.add_argument("--resolve-relative", action="store_true", help="Resolve ./ and ../ image refs against the referencing file")
+    ap.add_argument("--check-case", action="store_true", help="Match image refs case-sensitively on every host; report case-only misses")
+    ap.add_argument("--cross-file-ids", action="store_true", help="Also report frontend ids used by more than one file")
+    ap.add_argument("--id-entry", action="append", default=[], metavar="GLOB",
+                    help="Group cross-file ids per frontend entry file and its imports; implies --cross-file-ids")
+    ap.add_argument("--changed-since", metavar="REF", default="", help="Only audit files changed since REF (both roots)")
+    ap.add_argument("--repo-checks", action="store_true", help="With --changed-since, still run the repository-wide checks")
+    ap.add_argument("--max-header-lines", type=int, default=DEFAULT_MAX_HEADER_LINES, help=MAX_HEADER_LINES_HELP)
+    ap.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES, help=MAX_FILE_BYTES_HELP)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Shared pool size for both audits")
+    ap.add_argument("--executor", choices=["thread", "process"], default="thread", help="Shared pool kind")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not write the per-root scan caches")
+    ap.add_argument("--verify-checkpoints", action="store_true", help="Also verify checkpoints against their manifest")
+    ap.add_argument("--quiet", action="store_true", help="One summary line per audit plus the verdict")
+    ap.add_argument("--ndjson", type=Path, default=None, help="Write frontend + backend findings, one JSON object per line")
+    ap.add_argument("--trace", type=Path, default=None, help="Chrome trace-event file; one track per audit")
+    ap.add_argument("--fix-headers", action="store_true", help="Insert the LEEWAY header into flagged files of both roots")
+    ap.add_argument("--dry-run", action="store_true",
+                    help=f"With --fix-headers, change nothing; write <root>/run/{header_fix.DIFF_NAME} per root")
+    ap.add_argument("--header-template", type=Path, default=None,
+                    help="Standard JSON whose \"header\" section drives --fix-headers (default: system_header_leeway_v11.json)")
+    args = ap.parse_args()
+
+    fe_root, be_root = args.fe_root.resolve(), args.be_root.resolve()
+    fe_ignore = args.fe_ignore_file.resolve() if args.fe_ignore_file else None
+    be_ignore = args.be_ignore_file.resolve() if args.be_ignore_file else None
+    fe_inline = [] if fe_ignore else list(fe.DEFAULT_IGNORES)
+    be_patterns = load_ignore_patterns(be_ignore, [] if be_ignore else list(be.DEFAULT_IGNORES))
+    strict = args.strict or ""
+    fe_changes = be_changes = None
+    if args.changed_since:
+        try:
+            fe_changes = changed_files(fe_root, args.changed_since)
+            # One diff serves both roots when they live in the same repository
+            be_changes = fe_changes if fe_changes.top in (be_root, *be_root.parents) else changed_files(be_root, args.changed_since)
+        except GitError as e:
+            print(f"--changed-since: {e}", file=sys.stderr); sys.exit(2)
+
+    try:
+        fe_template = header_fix.HeaderTemplate.load(args.header_template, "frontend") if args.fix_headers else None
+        be_template = header_fix.HeaderTemplate.load(args.header_template, "backend") if args.fix_headers else None
+    except ValueError as e:
+        print(f"--fix-headers: {e}", file=sys.stderr); sys.exit(2)
+
+    fe_metrics, be_metrics = Metrics("frontend"), Metrics("backend")
+    Pool = ProcessPoolExecutor if args.executor == "process" else ThreadPoolExecutor
+    # Two orchestration threads drive the audits; all file-level work lands on the one shared pool
+    with Pool(max_workers=max(1, args.workers)) as pool, ThreadPoolExecutor(max_workers=2) as orch:
+        fut_fe = orch.submit(
+            fe.audit, root=fe_root, ignore_file=fe_ignore, inline_ignores=fe_inline, require_images=args.require_image,
+            max_header_lines=args.max_header_lines, workers=args.workers, use_cache=not args.no_cache,
+            executor=args.executor, max_file_bytes=args.max_file_bytes, pool=pool,
+            config={"strict": FE_STRICT.get(strict, ""), "format": "json", "entry": "leeway_audit_all"}, metrics=fe_metrics,
+            asset_roots=fe.DEFAULT_ASSET_ROOTS + args.asset_root, resolve_relative=args.resolve_relative,
+            check_case=args.check_case, changes=fe_changes, repo_checks=args.repo_checks,
+            cross_file_ids=args.cross_file_ids, id_entries=args.id_entry,
+        )
+        fut_be = orch.submit(
+            be.audit_backend, root=be_root, patterns=be_patterns, use_cache=not args.no_cache,
+            max_header_lines=args.max_header_lines, max_file_bytes=args.max_file_bytes,
+            verify_checkpoints=args.verify_checkpoints, manifest=None, hash_workers=args.workers, pool=pool,
+            config={"strict": BE_STRICT.get(strict, ""), "ignore_file": str(be_ignore or ""), "entry": "leeway_audit_all"},
+            metrics=be_metrics, changes=be_changes, repo_checks=args.repo_checks,
+        )
+        fe_report, _, _ = fut_fe.result()
+        be_report = fut_be.result()
+        if args.fix_headers:
+            # Same shared pool; a file under both roots is fixed once (the second pass finds the header)
+            fixes = [(fe_root, fe.fix_report_headers(fe_root, fe_report, fe_template, args.dry_run, fe_metrics, args.workers,
+                                                     pool, args.max_header_lines)),
+                     (be_root, be.fix_report_headers(be_root, be_report, be_template, args.dry_run, be_metrics, args.workers,
+                                                     pool, args.max_header_lines))]
+
+    fe_dict = fe_report.__dict__
+    be.write_json((args.fe_out or fe_root / "run" / "leeway_frontend_audit_report.json").resolve(), fe_dict)
+    be.write_json((args.be_out or be_root / "run" / "leeway_audit_report.json").resolve(), be_report)
+    be.write_html_reports((args.html_out or be_root / "run" / "leeway_audit_report.html").resolve(), fe_dict, be_report)
+    if args.ndjson:
+        write_ndjson(args.ndjson.resolve(), itertools.chain(fe.iter_findings(fe_report), be.iter_findings(be_report)))
+    if args.trace: write_trace(args.trace.resolve(), fe_metrics, be_metrics)
+
+    counts: Dict[str, int] = {
+        "frontend headers missing": len(fe_report.headers_missing),
+        "frontend files with duplicate IDs": len(fe_report.duplicate_ids),
+        "frontend ids used by more than one file": sum(1 for _ in fe._cross_file_hits(fe_report)),
+        "backend headers missing": len(be_report["headers_missing"]),
+        "backend missing dirs": sum(1 for ok in (be_report.get("dirs") or {}).values() if not ok),
+    }
+    if args.quiet: print(", ".join(f"{k}: {v}" for k, v in counts.items()))
+    else:
+        print("\n=== LEEWAY AUDIT (FRONTEND + BACKEND) ===")
+        for k, v in counts.items(): print(f"{k}: {v}")
+    if args.fix_headers:
+        for root, f in fixes: print(header_fix.summary_line(root, f, args.dry_run))
+
+    fails: List[str] = []
+    if strict in FE_STRICT: fails += frontend_failures(fe_report, FE_STRICT[strict])
+    if strict in BE_STRICT: fails += be.strict_failures(be_report, BE_STRICT[strict], ignore_ffmpeg=args.no_ffmpeg)
+    if fails:
+        print("\n❌ LEEWAY AUDIT FAIL\n" + "\n".join(f" - {x}" for x in fails)); sys.exit(1)
+    print("\n✅ LEEWAY AUDIT PASS")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+LEEWAY HEADER
+REGION: FRONTEND.AUDIT.CLIENT.V1
+5WH: WHAT=Thin client for the resident frontend audit (--serve); WHY=pre-commit/editor hooks in milliseconds;
+WHO=RapidWebDevelop; WHERE=tools/leeway_audit_client.py; WHEN=2025-10-04;
+HOW=python tools/leeway_audit_client.py audit src/App.tsx | report | ping | shutdown
+SPDX-License-Identifier: MIT
+"""
+
+# Deliberately stdlib-only and tiny: importing the audit itself would defeat the point.
+import argparse, json, os, socket, sys
+from pathlib import Path
+
+REPO_ROOT = Path(os.getenv("GITHUB_WORKSPACE") or os.getcwd()).resolve()
+DEFAULT_ROOT = (REPO_ROOT / (os.getenv("LW_FRONTEND_ROOT") or "frontend")).resolve()
+SOCKET_NAME = "leeway_frontend_audit.sock"
+
+def query(sock_path: Path, req: dict, timeout: float = 30.0) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(sock_path))
+        s.sendall(json.dumps(req).encode("utf-8") + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(1 << 16)
+            if not chunk: break
+            buf += chunk
+    return json.loads(buf.decode("utf-8"))
+
+def main():
+    ap = argparse.ArgumentParser(description="Query a running `leeway_frontend_audit.py --serve`")
+    ap.add_argument("op", choices=["audit", "report", "ping", "shutdown"])
+    ap.add_argument("paths", nargs="*", help="Files to audit (op=audit); relative to the cwd or absolute")
+    ap.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="frontend root (locates the default socket)")
+    ap.add_argument("--socket", type=Path, default=None, help="Socket path (default: <root>/run/leeway_frontend_audit.sock)")
+    args = ap.parse_args()
+
+    sock_path = args.socket or args.root.resolve() / "run" / SOCKET_NAME
+    req = {"op": args.op}
+    if args.op == "audit": req["paths"] = [str(Path(p).resolve()) for p in args.paths]
+    try: resp = query(sock_path, req)
+    except OSError as e:
+        print(f"leeway audit daemon not reachable at {sock_path}: {e}", file=sys.stderr); sys.exit(2)
+
+    print(json.dumps(resp, indent=2))
+    if not resp.get("ok"): sys.exit(2)
+    if args.op == "audit":
+        bad = [p for p, r in resp["results"].items()
+               if r.get("error") or (not r.get("ignored") and not r.get("skipped")
+                                     and (not r.get("header") or r.get("duplicate_ids") or r.get("missing_assets")
+                                          or r.get("cross_file_ids")))]
+        sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
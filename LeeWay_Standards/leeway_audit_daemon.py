@@ -0,0 +1,323 @@
+"""
+LEEWAY HEADER
+REGION: FRONTEND.AUDIT.DAEMON.V1
+5WH: WHAT=Resident frontend audit: in-memory file index + results, inotify (stat-poll fallback), Unix-socket queries;
+WHY=pre-commit/editor hooks get answers in ms instead of a cold import+walk+scan; WHO=RapidWebDevelop;
+WHERE=tools/leeway_audit_daemon.py; WHEN=2025-10-04; HOW=python tools/leeway_frontend_audit.py --serve
+SPDX-License-Identifier: MIT
+"""
+
+import ctypes, ctypes.util, json, os, selectors, socket, struct, sys, time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import leeway_frontend_audit as fe
+from leeway_id_index import IdIndex
+from leeway_scan_cache import ScanCache
+from leeway_walk import IgnoreMatcher, walk_files
+
+SOCKET_NAME = "leeway_frontend_audit.sock"  # lives in <root>/run/
+POLL_INTERVAL = 2.0
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# ---------- Watchers: poll() -> set of changed abs paths, or None meaning "resync everything" ----------
+
+class PollingWatcher:
+    """Fallback: pruned re-walk + stat compare every `interval` seconds."""
+
+    def __init__(self, root: Path, matcher: IgnoreMatcher, interval: float = POLL_INTERVAL):
+        self.root, self.matcher, self.interval = root, matcher, interval
+        self._stats = self._snapshot()
+
+    def fileno(self) -> Optional[int]:
+        return None  # nothing to select on; serve() calls poll() on a timer
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snap: Dict[str, Tuple[int, int]] = {}
+        for p in walk_files(self.root, self.matcher, fe.SCAN_EXTS_ALL):
+            try: st = p.stat()
+            except OSError: continue
+            snap[str(p)] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def poll(self) -> Optional[Set[str]]:
+        new = self._snapshot()
+        changed = {k for k in new.keys() | self._stats.keys() if new.get(k) != self._stats.get(k)}
+        self._stats = new
+        return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Linux inotify through libc (no third-party deps). One watch per non-ignored directory."""
+
+    IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x4, 0x8, 0x40, 0x80
+    IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_MOVE_SELF = 0x100, 0x200, 0x400, 0x800
+    IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR, IN_ONLYDIR = 0x4000, 0x8000, 0x40000000, 0x01000000
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: Path, matcher: IgnoreMatcher):
+        self.root, self.matcher = root, matcher
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wd: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def fileno(self) -> Optional[int]:
+        return self._fd
+
+    def _add_tree(self, top: Path):
+        stack = [top]
+        while stack:
+            d = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(d)), self.MASK | self.IN_ONLYDIR)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == 28: raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue
+            self._wd[wd] = str(d)
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False) and not self.matcher.ignored(self._rel(e.path), is_dir=True):
+                            stack.append(Path(e.path))
+            except OSError:
+                continue
+
+    def _rel(self, path: str) -> str:
+        return Path(path).relative_to(self.root).as_posix()
+
+    def poll(self) -> Optional[Set[str]]:
+        changed: Set[str] = set()
+        try: buf = os.read(self._fd, 1 << 16)
+        except BlockingIOError: return changed
+        off = 0
+        while off < len(buf):
+            wd, mask, _cookie, ln = self._EVENT.unpack_from(buf, off)
+            name = buf[off + 16: off + 16 + ln].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            off += 16 + ln
+            if mask & self.IN_Q_OVERFLOW: return None
+            if mask & self.IN_IGNORED: self._wd.pop(wd, None); continue
+            base = self._wd.get(wd)
+            if base is None: continue
+            path = os.path.join(base, name) if name else base
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and not self.matcher.ignored_path(self._rel(path), is_dir=True):
+                    self._add_tree(Path(path))
+                changed.add(path + os.sep)  # trailing sep = whole subtree
+            elif name:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+def make_watcher(root: Path, matcher: IgnoreMatcher, force_poll: bool = False):
+    if not force_poll and sys.platform.startswith("linux"):
+        try: return InotifyWatcher(root, matcher)
+        except (OSError, AttributeError) as e:
+            print(f"[serve] inotify unavailable ({e}); falling back to stat polling", file=sys.stderr)
+    return PollingWatcher(root, matcher)
+
+# ---------- Resident state ----------
+
+class AuditState:
+    """
+    File index + per-file FileScan results for one root, updated incrementally.
+    With cross-file ids on, an IdIndex is kept too; it cannot drop a file, so after changes it is
+    rebuilt on the next query from the previous index plus the rescanned files (no re-reads).
+    """
+
+    def __init__(self, root: Path, patterns: List[str], require_images: List[str],
+                 max_header_lines: int, max_file_bytes: int, asset_roots: Optional[List[str]] = None,
+                 resolve_relative: bool = False, check_case: bool = False, cross_file_ids: bool = False,
+                 id_entries: Optional[List[str]] = None):
+        self.root = root
+        self.asset_roots = asset_roots or fe.DEFAULT_ASSET_ROOTS
+        self.resolve_relative = resolve_relative
+        self.check_case = check_case
+        self.patterns = patterns
+        self.matcher = IgnoreMatcher(patterns)
+        self.require_images = require_images
+        self.max_header_lines = max_header_lines
+        self.max_file_bytes = max_file_bytes
+        self.id_entries = id_entries or []
+        self.id_index: Optional[IdIndex] = IdIndex() if cross_file_ids or self.id_entries else None
+        self._id_stale: Set[str] = set()  # paths rescanned or dropped since id_index was built
+        self.scans: Dict[str, fe.FileScan] = {}
+        self.updated = 0.0
+
+    def resync(self, workers: int = 1, executor: str = "thread"):
+        files = walk_files(self.root, self.matcher, fe.SCAN_EXTS_ALL)
+        index = IdIndex() if self.id_index is not None else None
+        scans = fe._scan_files(files, self.max_header_lines, workers, ScanCache(None, ""), executor, self.max_file_bytes,
+                               id_index=index)
+        self.scans = {s.path: s for s in scans}
+        self.id_index, self._id_stale = index, set()
+        self.updated = time.time()
+
+    def _wanted(self, path: str) -> bool:
+        try: rel = Path(path).relative_to(self.root).as_posix()
+        except ValueError: return False
+        return Path(path).suffix.lower() in fe.SCAN_EXTS_ALL and not self.matcher.ignored_path(rel)
+
+    def refresh(self, paths: Set[str]):
+        for path in paths:
+            if path.endswith(os.sep):  # directory event: rescan or drop the whole subtree
+                for k in [k for k in self.scans if k.startswith(path)]: del self.scans[k]; self._id_stale.add(k)
+                d = Path(path.rstrip(os.sep))
+                rel = d.relative_to(self.root).as_posix()
+                if d.is_dir() and not self.matcher.ignored_path(rel, is_dir=True):
+                    for p in walk_files(d, self.matcher, fe.SCAN_EXTS_ALL, rel_prefix=rel + "/"):
+                        self._rescan(str(p))
+                continue
+            if os.path.isfile(path) and self._wanted(path): self._rescan(path)
+            elif self.scans.pop(path, None): self._id_stale.add(path)
+        if paths: self.updated = time.time()
+
+    def _rescan(self, path: str):
+        self.scans[path] = fe._scan_file(Path(path), self.max_header_lines, None, self.max_file_bytes,
+                                         self.id_index is not None)
+        self._id_stale.add(path)
+
+    def _ids(self) -> IdIndex:
+        if self._id_stale:
+            old, new = self.id_index, IdIndex()
+            for path in sorted(self.scans):
+                s = self.scans[path]
+                if path in self._id_stale: ids, imports = s.ids, s.imports
+                elif path in old: ids, imports = old.entry(path)
+                else: continue
+                if ids or imports: new.add(path, ids, imports)
+                s.ids, s.imports = {}, []  # held by the index from here on
+            self.id_index, self._id_stale = new, set()
+        return self.id_index
+
+    def report(self) -> "fe.Report":
+        ordered = [self.scans[k] for k in sorted(self.scans)]
+        rept = fe._build_report(self.root, ordered, self.require_images, asset_roots=self.asset_roots,
+                                resolve_relative=self.resolve_relative, check_case=self.check_case, config={
+            "max_header_lines": str(self.max_header_lines),
+            "max_file_bytes": str(self.max_file_bytes),
+            "asset_roots": ",".join(self.asset_roots),
+            "resolve_relative": str(self.resolve_relative).lower(),
+            "check_case": str(self.check_case).lower(),
+            **({"cross_file_ids": "true", "id_entries": ",".join(self.id_entries)} if self.id_index is not None else {}),
+            "mode": "serve",
+        })
+        if self.id_index is not None:
+            rept.cross_file_duplicate_ids, rept.cross_file_duplicate_ids_by_entry = fe._id_collisions(
+                self.root, self._ids(), self.id_entries)
+        return rept
+
+    def audit_paths(self, paths: List[str]) -> Dict[str, dict]:
+        """Fresh (re-read) verdicts for specific files; also folds them into the resident index."""
+        out: Dict[str, dict] = {}
+        index = fe.AssetIndex(self.root, self.asset_roots, case_sensitive=self.check_case)
+        for raw in paths:
+            p = Path(raw)
+            p = (p if p.is_absolute() else self.root / p).resolve()
+            key = str(p)
+            # Only files of this root: the socket must not become a way to read anything else
+            if p != self.root and self.root not in p.parents: out[key] = {"error": "outside root"}; continue
+            if not p.is_file():
+                if self.scans.pop(key, None): self._id_stale.add(key)
+                out[key] = {"error": "not a file"}; continue
+            if not self._wanted(key): out[key] = {"ignored": True}; continue
+            self._rescan(key)
+            s = self.scans[key]
+            mismatches: Dict[str, str] = {}
+            found = fe._check_assets(index, s.image_refs, mismatches=mismatches if self.check_case else None)
+            missing = [r for r, raw in zip(s.image_refs, s.rel_refs)
+                       if not found[r] and not (self.resolve_relative and raw and index.resolve_relative(key, raw))]
+            out[key] = {
+                "header": s.header,
+                "duplicate_ids": s.dup_ids,
+                "missing_assets": list(dict.fromkeys(missing)),
+                "skipped": s.skipped,
+            }
+            if self.id_index is not None:
+                repo_wide, by_entry = fe._id_collisions(self.root, self._ids(), self.id_entries, {key})
+                out[key]["cross_file_ids"] = by_entry if self.id_entries else repo_wide
+            if self.check_case:
+                out[key]["case_mismatches"] = {r: alt for r, alt in mismatches.items() if r in missing}
+        return out
+
+# ---------- Server ----------
+
+def _handle(state: AuditState, req: dict) -> Tuple[dict, bool]:
+    op = req.get("op")
+    if op == "ping":
+        return {"ok": True, "files": len(state.scans), "updated": state.updated}, False
+    if op == "report":
+        return {"ok": True, "report": state.report().__dict__}, False
+    if op == "audit":
+        return {"ok": True, "results": state.audit_paths(list(req.get("paths") or []))}, False
+    if op == "shutdown":
+        return {"ok": True}, True
+    return {"ok": False, "error": f"unknown op {op!r}"}, False
+
+def _serve_client(state: AuditState, conn: socket.socket) -> bool:
+    conn.settimeout(5.0)
+    buf = b""
+    try:
+        while not buf.endswith(b"\n") and len(buf) < MAX_REQUEST_BYTES:
+            chunk = conn.recv(65536)
+            if not chunk: break
+            buf += chunk
+        try: req = json.loads(buf.decode("utf-8") or "{}")
+        except ValueError: req = {}
+        resp, stop = _handle(state, req)
+        conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+        return stop
+    except OSError:
+        return False
+    finally:
+        conn.close()
+
+def serve(state: AuditState, sock_path: Path, force_poll: bool = False, workers: int = 1, executor: str = "thread"):
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("--serve needs Unix domain sockets (AF_UNIX) on this platform")
+    t0 = time.perf_counter()
+    state.resync(workers, executor)
+    watcher = make_watcher(state.root, state.matcher, force_poll)
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sock_path.exists(): sock_path.unlink()
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Owner-only from the moment it exists: other users on a shared agent must not connect (or send shutdown)
+    old_umask = os.umask(0o077)
+    try: srv.bind(str(sock_path))
+    finally: os.umask(old_umask)
+    os.chmod(sock_path, 0o600)
+    srv.listen(16)
+    print(f"[serve] {len(state.scans)} file(s) indexed in {time.perf_counter() - t0:.2f}s; "
+          f"{type(watcher).__name__}; listening on {sock_path}", file=sys.stderr)
+
+    sel = selectors.DefaultSelector()
+    sel.register(srv, selectors.EVENT_READ, "client")
+    fd = watcher.fileno()
+    if fd is not None: sel.register(fd, selectors.EVENT_READ, "fs")
+    next_poll = time.monotonic() + getattr(watcher, "interval", 0)
+    try:
+        while True:
+            timeout = None if fd is not None else max(0.0, next_poll - time.monotonic())
+            for key, _ in sel.select(timeout):
+                if key.data == "client":
+                    conn, _ = srv.accept()
+                    if _serve_client(state, conn): return
+                else:
+                    changed = watcher.poll()
+                    if changed is None: state.resync(workers, executor)
+                    else: state.refresh(changed)
+            if fd is None and time.monotonic() >= next_poll:
+                state.refresh(watcher.poll())
+                next_poll = time.monotonic() + watcher.interval
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sel.close(); srv.close(); watcher.close()
+        try: sock_path.unlink()
+        except OSError: pass
@@ -0,0 +1,282 @@
+"""
+LEEWAY HEADER
+REGION: AUDIT.BENCH.SUITE.V1
+5WH: WHAT=Deterministic synthetic frontend+backend trees; per-phase timings for both audits across executors;
+baselines with regression thresholds; WHY=judge perf changes on numbers, not guesses; WHO=RapidWebDevelop;
+WHERE=tools/leeway_bench.py; WHEN=2025-10-04;
+HOW=python tools/leeway_bench.py [--files 5000] [--save-baseline run/bench.json | --baseline run/bench.json]
+SPDX-License-Identifier: MIT
+"""
+
+import argparse, json, os, platform, random, shutil, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import leeway_audit as be
+import leeway_frontend_audit as fe
+from leeway_checkpoints import digest_files
+from leeway_headers import DEFAULT_MAX_FILE_BYTES, DEFAULT_MAX_HEADER_LINES, has_header
+from leeway_report_io import write_json
+from leeway_scan_cache import ScanCache
+from leeway_walk import load_ignore_patterns
+
+BASELINE_VERSION = 1
+HEADER = "/*\nLEEWAY HEADER\nREGION: BENCH.SYNTHETIC\nSPDX-License-Identifier: MIT\n*/\n"
+PY_HEADER = '"""\nLEEWAY HEADER\nREGION: BENCH.SYNTHETIC\nSPDX-License-Identifier: MIT\n"""\n'
+FE_EXTS = [".tsx", ".tsx", ".ts", ".jsx", ".css", ".html", ".md"]  # weighted toward components
+MODEL_NAMES = ["phi3-mini", "gemma-2b", "llama-3-8b", "voice-en", "Absolute_Zero_Reasoner"]
+
+@dataclass
+class BenchSpec:
+    files: int = 2000               # frontend source files (outside node_modules)
+    size_kb: float = 4.0            # median file size; sizes are lognormal around it
+    size_sigma: float = 1.0
+    max_size_kb: float = 512.0
+    header_ratio: float = 0.8       # fraction of files that carry a LEEWAY header
+    node_modules_depth: int = 3     # nesting of node_modules/<pkg>/node_modules/...
+    node_modules_files: int = 500
+    ids_per_kb: float = 2.0         # id="..." attributes in .tsx/.jsx/.html
+    dup_ratio: float = 0.05         # chance an id repeats one already used in the same file
+    img_refs_per_kb: float = 0.5
+    missing_img_ratio: float = 0.2  # refs with no file under public/
+    be_files: int = 500             # backend files with HEADER_EXTS
+    models: int = 5
+    checkpoint_mb: List[float] = field(default_factory=lambda: [8.0])  # cycled over CHECKPOINT_LAYOUT files
+    seed: int = 1
+
+# ---------- Generator ----------
+
+def _file_bytes(rng: random.Random, spec: BenchSpec) -> int:
+    kb = min(spec.max_size_kb, rng.lognormvariate(0, spec.size_sigma) * spec.size_kb)
+    return max(64, int(kb * 1024))
+
+def _frontend_text(rng: random.Random, spec: BenchSpec, ext: str, size: int, images: List[str]) -> str:
+    kb = size / 1024
+    n_ids = int(kb * spec.ids_per_kb) if ext in fe.SCAN_EXTS_IDS else 0
+    n_imgs = int(kb * spec.img_refs_per_kb)
+    parts: List[str] = [HEADER if rng.random() < spec.header_ratio else "// plain file\n"]
+    used: List[str] = []
+    for _ in range(n_ids):
+        _id = rng.choice(used) if used and rng.random() < spec.dup_ratio else f"el-{len(used)}-{rng.randrange(1 << 20)}"
+        used.append(_id)
+        parts.append(f'<div id="{_id}" className="slide">row {len(used)}</div>\n')
+    for _ in range(n_imgs):
+        if rng.random() < spec.missing_img_ratio: img = f"image/missing-{rng.randrange(1000)}.png"
+        else: img = rng.choice(images)
+        parts.append(f'<img src="/{img}" alt="" />\n')
+    body = "".join(parts)
+    filler = "const lorem = 'ipsum dolor sit amet';\n"
+    if len(body) < size: body += filler * ((size - len(body)) // len(filler) + 1)
+    return body
+
+def _write_blob(path: Path, size: int, rng: random.Random):
+    block = rng.randbytes(1 << 20) if hasattr(rng, "randbytes") else bytes(rng.getrandbits(8) for _ in range(1 << 16))
+    with open(path, "wb") as fh:
+        left = size
+        while left > 0:
+            fh.write(block[:left]); left -= len(block)
+
+def generate_frontend(root: Path, spec: BenchSpec):
+    rng = random.Random(f"fe-{spec.seed}")
+    images = [f"image/img-{i}.png" for i in range(50)]
+    public = root / "public"
+    for rel in images + fe.BASE_REQUIRED_IMAGES:
+        p = public / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"\x89PNG\r\n\x1a\n")
+    for i in range(spec.files):
+        ext = rng.choice(FE_EXTS)
+        p = root / "src" / f"d{i % 40}" / f"f{i}{ext}"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(_frontend_text(rng, spec, ext, _file_bytes(rng, spec), images), encoding="utf-8")
+    # Dependency tree the walker must prune, nested like a real install
+    per_dir = max(1, spec.node_modules_files // max(1, spec.node_modules_depth))
+    d = root
+    for depth in range(max(0, spec.node_modules_depth)):
+        d = d / "node_modules" / f"pkg{depth}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(per_dir):
+            (d / f"index{j}.js").write_text(f"module.exports = {j};\n" * 32, encoding="utf-8")
+
+def generate_backend(root: Path, spec: BenchSpec):
+    rng = random.Random(f"be-{spec.seed}")
+    for rel in be.REQUIRED_DIRS:
+        (root / Path(*rel.split("/"))).mkdir(parents=True, exist_ok=True)
+    (root / "requirements.txt").write_text("\n".join(be.REQUIRED_PY_PKGS) + "\n", encoding="utf-8")
+    exts = [e for e in be.HEADER_EXTS if e != ".md"] + [".md"]
+    for i in range(spec.be_files):
+        ext = exts[i % len(exts)]
+        p = root / ("routes" if i % 3 else "tools") / f"m{i}{ext}"
+        head = PY_HEADER if ext == ".py" else HEADER
+        body = (head if rng.random() < spec.header_ratio else "# plain\n") + "x = 1\n" * (_file_bytes(rng, spec) // 6)
+        p.write_text(body, encoding="utf-8")
+    for m in range(spec.models):
+        d = root / "models" / MODEL_NAMES[m % len(MODEL_NAMES)] / f"v{m}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(20): (d / f"shard{j}.py").write_text("weights = None\n", encoding="utf-8")
+    sizes = spec.checkpoint_mb or [0.0]
+    for i, rel in enumerate(be.checkpoint_rels()):
+        p = root / "checkpoints" / Path(*rel.split("/"))
+        p.parent.mkdir(parents=True, exist_ok=True)
+        _write_blob(p, int(sizes[i % len(sizes)] * 1024 * 1024), rng)
+
+# ---------- Phases ----------
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+def _pool(executor: str, workers: int):
+    if executor == "process": return ProcessPoolExecutor(max_workers=workers)
+    if executor == "thread": return ThreadPoolExecutor(max_workers=workers)
+    return None
+
+def bench_frontend(root: Path, executors: List[str], workers: int, repeat: int, out_dir: Path) -> Dict[str, float]:
+    res: Dict[str, float] = {}
+    patterns = load_ignore_patterns(None, list(fe.DEFAULT_IGNORES))
+    files: List[Path] = []
+    def walk(): files[:] = fe._list_files(root, fe.SCAN_EXTS_ALL, patterns)
+    res["fe.walk"] = _best(walk, repeat)
+
+    blobs: List[bytes] = []
+    def read(): blobs[:] = [p.read_bytes() for p in files]
+    res["fe.read"] = _best(read, repeat)
+
+    def regex():
+        for data in blobs:
+            t = data.decode("utf-8", "ignore")
+            has_header(t, DEFAULT_MAX_HEADER_LINES); fe._detect_duplicate_ids(t); fe._detect_image_refs_bytes(data)
+    res["fe.regex"] = _best(regex, repeat)
+
+    scans: list = []
+    for ex in executors:
+        def scan(): scans[:] = fe._scan_files(files, DEFAULT_MAX_HEADER_LINES, workers, ScanCache(None, ""), ex, DEFAULT_MAX_FILE_BYTES)
+        res[f"fe.scan.{ex}"] = _best(scan, repeat)
+
+    cache_path = out_dir / "fe_bench_cache.json"
+    sig = fe._cache_signature(DEFAULT_MAX_HEADER_LINES, DEFAULT_MAX_FILE_BYTES)
+    warm = ScanCache.load(cache_path, sig)
+    fe._scan_files(files, DEFAULT_MAX_HEADER_LINES, workers, warm, "serial", DEFAULT_MAX_FILE_BYTES); warm.save()
+    def scan_cached():
+        fe._scan_files(files, DEFAULT_MAX_HEADER_LINES, workers, ScanCache.load(cache_path, sig), "serial", DEFAULT_MAX_FILE_BYTES)
+    res["fe.scan.cached"] = _best(scan_cached, repeat)
+
+    def report():
+        rep = fe._build_report(root, scans, [], config={})
+        write_json(out_dir / "fe_report.json", rep.__dict__)
+    res["fe.report"] = _best(report, repeat)
+    return res
+
+def bench_backend(root: Path, executors: List[str], workers: int, repeat: int, out_dir: Path) -> Dict[str, float]:
+    res: Dict[str, float] = {}
+    patterns = load_ignore_patterns(None, list(be.DEFAULT_IGNORES))
+    inv_box: list = [None]
+    def walk(): inv_box[0] = be.build_inventory(root, patterns)
+    res["be.walk"] = _best(walk, repeat)
+    inv = inv_box[0]
+
+    for ex in executors:
+        pool = _pool(ex, workers)
+        try: res[f"be.headers.{ex}"] = _best(lambda: be.scan_headers_backend(root, None, inv=inv, pool=pool), repeat)
+        finally:
+            if pool: pool.shutdown()
+
+    def checks(): be.check_dirs(root, inv); be.check_models(root, inv); be.check_checkpoints(root, inv)
+    res["be.checks"] = _best(checks, repeat)
+
+    ckpts = [root / "checkpoints" / Path(*r.split("/")) for r in be.checkpoint_rels()]
+    res["be.hash"] = _best(lambda: digest_files(ckpts, workers), repeat)
+
+    rept = be.audit_backend(root, patterns, use_cache=False)
+    res["be.report"] = _best(lambda: write_json(out_dir / "be_report.json", rept), repeat)
+    return res
+
+# ---------- Baselines ----------
+
+def compare(results: Dict[str, float], baseline: dict, threshold: float, min_delta: float) -> List[str]:
+    """Phases slower than baseline * (1 + threshold) by more than `min_delta` seconds (timer noise floor)."""
+    regressions: List[str] = []
+    for phase, base in (baseline.get("results") or {}).items():
+        now = results.get(phase)
+        if now is None: continue
+        if now > base * (1 + threshold) and now - base > min_delta:
+            regressions.append(f"{phase}: {now:.4f}s vs baseline {base:.4f}s (+{(now / base - 1) * 100 if base else float('inf'):.0f}%)")
+    return regressions
+
+def main():
+    d = BenchSpec()
+    ap = argparse.ArgumentParser(description="LeeWay audit benchmark on a deterministic synthetic repo")
+    ap.add_argument("--files", type=int, default=d.files, help="Frontend source files")
+    ap.add_argument("--size-kb", type=float, default=d.size_kb, help="Median file size (lognormal)")
+    ap.add_argument("--size-sigma", type=float, default=d.size_sigma, help="Lognormal sigma of file sizes")
+    ap.add_argument("--max-size-kb", type=float, default=d.max_size_kb)
+    ap.add_argument("--header-ratio", type=float, default=d.header_ratio)
+    ap.add_argument("--node-modules-depth", type=int, default=d.node_modules_depth)
+    ap.add_argument("--node-modules-files", type=int, default=d.node_modules_files)
+    ap.add_argument("--ids-per-kb", type=float, default=d.ids_per_kb)
+    ap.add_argument("--dup-ratio", type=float, default=d.dup_ratio, help="Chance an id repeats within its file")
+    ap.add_argument("--img-refs-per-kb", type=float, default=d.img_refs_per_kb)
+    ap.add_argument("--missing-img-ratio", type=float, default=d.missing_img_ratio)
+    ap.add_argument("--be-files", type=int, default=d.be_files, help="Backend files with header extensions")
+    ap.add_argument("--models", type=int, default=d.models)
+    ap.add_argument("--checkpoint-mb", type=float, nargs="+", default=d.checkpoint_mb, help="Checkpoint sizes (cycled)")
+    ap.add_argument("--seed", type=int, default=d.seed)
+    ap.add_argument("--executors", nargs="+", choices=list(fe.EXECUTORS), default=list(fe.EXECUTORS))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N per phase")
+    ap.add_argument("--workdir", type=Path, default=None,
+                    help="Parent for a fresh leeway_bench_* directory holding the trees, kept afterwards (default: system temp, removed)")
+    ap.add_argument("--keep", action="store_true", help="Keep the generated trees")
+    ap.add_argument("--save-baseline", type=Path, default=None, help="Write results as the new baseline")
+    ap.add_argument("--baseline", type=Path, default=None, help="Compare against this baseline; exit 1 on regression")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown per phase (0.25 = +25%%)")
+    ap.add_argument("--min-delta", type=float, default=0.01, help="Ignore regressions smaller than this many seconds")
+    args = ap.parse_args()
+
+    spec = BenchSpec(
+        files=args.files, size_kb=args.size_kb, size_sigma=args.size_sigma, max_size_kb=args.max_size_kb,
+        header_ratio=args.header_ratio, node_modules_depth=args.node_modules_depth,
+        node_modules_files=args.node_modules_files, ids_per_kb=args.ids_per_kb, dup_ratio=args.dup_ratio,
+        img_refs_per_kb=args.img_refs_per_kb, missing_img_ratio=args.missing_img_ratio, be_files=args.be_files,
+        models=args.models, checkpoint_mb=args.checkpoint_mb, seed=args.seed,
+    )
+    # Always a directory of our own: "frontend"/"backend" under --workdir could be someone's real source trees
+    if args.workdir: args.workdir.mkdir(parents=True, exist_ok=True)
+    work = Path(tempfile.mkdtemp(prefix="leeway_bench_", dir=args.workdir)).resolve()
+    fe_root, be_root, out_dir = work / "frontend", work / "backend", work / "out"
+    try:
+        t0 = time.perf_counter()
+        for p in (fe_root, be_root, out_dir): p.mkdir()
+        generate_frontend(fe_root, spec); generate_backend(be_root, spec)
+        print(f"generated {work} in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+
+        results = {**bench_frontend(fe_root, args.executors, args.workers, args.repeat, out_dir),
+                   **bench_backend(be_root, args.executors, args.workers, args.repeat, out_dir)}
+    finally:
+        if not args.keep and args.workdir is None: shutil.rmtree(work, ignore_errors=True)
+
+    print(f"{'phase':<22} {'seconds':>9}")
+    for phase, s in results.items(): print(f"{phase:<22} {s:>9.4f}")
+
+    if args.save_baseline:
+        write_json(args.save_baseline.resolve(), {
+            "version": BASELINE_VERSION, "spec": asdict(spec), "workers": args.workers, "repeat": args.repeat,
+            "python": platform.python_version(), "machine": platform.machine(), "results": results,
+        })
+        print(f"Wrote {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("version") != BASELINE_VERSION or baseline.get("spec") != asdict(spec):
+            print("❌ baseline was recorded with a different spec/version; re-record it", file=sys.stderr); sys.exit(2)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print("\n❌ BENCH REGRESSION\n" + "\n".join(f" - {x}" for x in regressions)); sys.exit(1)
+        print(f"\n✅ BENCH WITHIN {args.threshold:.0%} OF BASELINE")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+LEEWAY HEADER
+REGION: FRONTEND.AUDIT.BENCH.IMAGEREFS
+5WH: WHAT=Benchmark image-ref discovery (IMG_REF_RE over decoded text vs bytes prefilter + windowed match);
+WHY=show the prefiltered scanner returns identical refs at a multiple of the throughput; WHO=RapidWebDevelop;
+WHERE=tools/leeway_bench_image_refs.py; WHEN=2025-10-04; HOW=python tools/leeway_bench_image_refs.py [--sizes-mb 1 4 16]
+SPDX-License-Identifier: MIT
+"""
+
+import argparse, random, time
+from typing import Callable, List
+
+from leeway_frontend_audit import _detect_image_refs, _detect_image_refs_bytes
+
+def _synthetic_source(size_mb: float, ref_every: int, seed: int = 7) -> bytes:
+    # Quote-heavy TS/CSS-like source; every `ref_every`-th line carries an image reference
+    rng = random.Random(seed)
+    lines: List[str] = []
+    total, i = 0, 0
+    target = int(size_mb * 1024 * 1024)
+    while total < target:
+        if i % ref_every == 0:
+            ln = rng.choice([
+                f'<img src="/image/pic-{i}.png" alt="slide {i}" />',
+                f"import hero{i} from './assets/hero-{i}.SVG';",
+                f".bg-{i} {{ background: url('image/bg-{i}.webp'); }}",
+            ])
+        else:
+            ln = f'const s{i} = {{ a: "k{i}", b: \'v{i % 13}\', c: "x.y.z", d: ["p", "q"] }};'
+        lines.append(ln); total += len(ln) + 1; i += 1
+    return "\n".join(lines).encode("utf-8")
+
+def _time(fn: Callable, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(arg); best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Image-ref discovery: full regex vs bytes prefilter")
+    ap.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--ref-every", type=int, default=25, help="One image reference every N lines")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'MB':>6} {'refs':>8} {'regex MB/s':>11} {'prefilter MB/s':>15} {'speedup':>8}")
+    for mb in args.sizes_mb:
+        data = _synthetic_source(mb, args.ref_every)
+        text = data.decode("utf-8")
+        refs = _detect_image_refs(text)
+        assert _detect_image_refs_bytes(data) == refs
+        # The regex column includes the decode it depends on; the prefilter never decodes the file
+        old = _time(lambda d: _detect_image_refs(d.decode("utf-8")), data, args.repeat)
+        new = _time(_detect_image_refs_bytes, data, args.repeat)
+        print(f"{mb:>6g} {len(refs):>8} {mb / old:>11.1f} {mb / new:>15.1f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+LEEWAY HEADER
+REGION: FRONTEND.AUDIT.BENCH.LINEINDEX
+5WH: WHAT=Benchmark duplicate-ID location lookup (count-per-match vs bisected newline index) on multi-MB files;
+WHY=show the LineIndex path scales linearly with file size; WHO=RapidWebDevelop;
+WHERE=tools/leeway_bench_line_index.py; WHEN=2025-10-04; HOW=python tools/leeway_bench_line_index.py [--sizes-mb 1 2 4 8]
+SPDX-License-Identifier: MIT
+"""
+
+import argparse, time
+from typing import List
+
+from leeway_frontend_audit import DUPLICATE_ID_RE, _detect_duplicate_ids
+
+def _synthetic_html(size_mb: float, dup_every: int) -> str:
+    # Deterministic slide-like markup; every `dup_every`-th line repeats an id
+    lines: List[str] = []
+    total, i = 0, 0
+    target = int(size_mb * 1024 * 1024)
+    while total < target:
+        ln = f'<div id="dup-{i % 50}" class="slide">row {i}</div>' if i % dup_every == 0 else f'<p class="c{i % 7}">text {i} lorem ipsum</p>'
+        lines.append(ln); total += len(ln) + 1; i += 1
+    return "\n".join(lines)
+
+def _legacy_lines(text: str):
+    # Pre-LineIndex approach: count newlines from offset 0 for every hit (quadratic)
+    out = {}
+    for m in DUPLICATE_ID_RE.finditer(text):
+        out.setdefault(m[m.lastindex], []).append(text.count("\n", 0, m.start()) + 1)
+    return {k: v for k, v in out.items() if len(v) > 1}
+
+def _time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(text); best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="LineIndex vs count-per-match benchmark")
+    ap.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--dup-every", type=int, default=20, help="One duplicate-id line every N lines")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-legacy", action="store_true", help="Skip the quadratic baseline (slow on large sizes)")
+    args = ap.parse_args()
+
+    print(f"{'MB':>6} {'hits':>8} {'index s':>9} {'s/MB':>7} {'legacy s':>9} {'s/MB':>7}")
+    for mb in args.sizes_mb:
+        text = _synthetic_html(mb, args.dup_every)
+        hits = sum(1 for _ in DUPLICATE_ID_RE.finditer(text))
+        new = _time(_detect_duplicate_ids, text, args.repeat)
+        row = f"{mb:>6g} {hits:>8} {new:>9.4f} {new / mb:>7.4f}"
+        if not args.no_legacy:
+            assert {k: [loc[0] for loc in v] for k, v in _detect_duplicate_ids(text).items()} == _legacy_lines(text)
+            old = _time(_legacy_lines, text, 1)
+            row += f" {old:>9.4f} {old / mb:>7.4f}"
+        print(row)
+    print("\nFlat s/MB = linear scaling; the legacy column grows with size (quadratic).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+LEEWAY HEADER
+REGION: BACKEND.AUDIT.CHECKPOINTS.V1
+5WH: WHAT=Checkpoint integrity manifest (sizes + chunked digests), parallel mmap hashing, verify cache;
+WHY=catch truncated/corrupt TTS checkpoints in CI instead of at service load time; WHO=RapidWebDevelop;
+WHERE=tools/leeway_checkpoints.py; WHEN=2025-10-04; HOW=python tools/leeway_audit.py --verify-checkpoints
+SPDX-License-Identifier: MIT
+"""
+
+import hashlib, json, mmap, os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from leeway_scan_cache import ScanCache, cache_signature
+
+MANIFEST_NAME = "checkpoints.manifest.json"  # lives in <root>/checkpoints/
+VERIFY_CACHE_NAME = "leeway_checkpoint_verify_cache.json"  # lives in <root>/run/
+ALGORITHM = "sha256-chunked"
+CHUNK_BYTES = 64 * 1024 * 1024  # multiple of mmap.ALLOCATIONGRANULARITY on every platform
+
+def _hash_range(job: Tuple[str, int, int]) -> bytes:
+    """sha256 of one [offset, offset+length) window, read through mmap (no Python-side copies)."""
+    path, offset, length = job
+    if length == 0: return hashlib.sha256(b"").digest()
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), length, offset=offset, access=mmap.ACCESS_READ) as mm:
+        return hashlib.sha256(mm).digest()
+
+def digest_files(paths: List[Path], workers: int, chunk_bytes: int = CHUNK_BYTES) -> Dict[str, str]:
+    """
+    Digest = sha256 over the concatenated sha256 of each `chunk_bytes` window. Windows are
+    independent, so one multi-GB file is spread across the whole pool, not just one core.
+    """
+    jobs: List[Tuple[str, int, int]] = []
+    spans: List[Tuple[str, int, int]] = []  # path -> [start, end) into jobs
+    for p in paths:
+        size = p.stat().st_size
+        start = len(jobs)
+        jobs += [(str(p), off, min(chunk_bytes, size - off)) for off in range(0, size, chunk_bytes)] or [(str(p), 0, 0)]
+        spans.append((str(p), start, len(jobs)))
+    if workers <= 1 or len(jobs) <= 1:
+        parts = [_hash_range(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+            parts = list(ex.map(_hash_range, jobs))
+    out: Dict[str, str] = {}
+    for path, start, end in spans:
+        h = hashlib.sha256()
+        for part in parts[start:end]: h.update(part)
+        out[path] = h.hexdigest()
+    return out
+
+def write_manifest(ckpt_dir: Path, rels: List[str], manifest: Path, workers: int) -> dict:
+    present = [r for r in rels if (ckpt_dir / Path(*r.split("/"))).is_file()]
+    digests = digest_files([ckpt_dir / Path(*r.split("/")) for r in present], workers)
+    files = {}
+    for r in present:
+        p = ckpt_dir / Path(*r.split("/"))
+        files[r] = {"size": p.stat().st_size, "digest": digests[str(p)]}
+    blob = {"algorithm": ALGORITHM, "chunk_bytes": CHUNK_BYTES, "files": files}
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(blob, indent=2), encoding="utf-8")
+    return blob
+
+def verify_manifest(ckpt_dir: Path, manifest: Path, workers: int, cache_path: Optional[Path]) -> dict:
+    """
+    -> {"manifest", "files": {rel: "ok" | "missing" | "size mismatch ..." | "digest mismatch"}, "hashed", "cached"}
+    Size is checked first (free); only size-matching files are hashed, and a digest already
+    verified for the same (size, mtime, inode) is reused from the cache.
+    """
+    res = {"manifest": str(manifest), "files": {}, "hashed": 0, "cached": 0}
+    try: blob = json.loads(manifest.read_text(encoding="utf-8"))
+    except Exception as e:
+        res["error"] = f"manifest unreadable: {e.__class__.__name__}"
+        return res
+    if blob.get("algorithm") != ALGORITHM:
+        res["error"] = f"unsupported algorithm {blob.get('algorithm')!r}"
+        return res
+    chunk_bytes = blob.get("chunk_bytes") or CHUNK_BYTES
+    # Windows are mmap offsets: anything else would fail inside the hashing pool
+    if type(chunk_bytes) is not int or chunk_bytes <= 0 or chunk_bytes % mmap.ALLOCATIONGRANULARITY:
+        res["error"] = f"invalid chunk_bytes {chunk_bytes!r} (need a positive multiple of {mmap.ALLOCATIONGRANULARITY})"
+        return res
+
+    cache = ScanCache.load(cache_path, cache_signature(ALGORITHM, chunk_bytes))
+    to_hash: List[Tuple[str, Path, os.stat_result]] = []
+    for rel, want in (blob.get("files") or {}).items():
+        p = ckpt_dir / Path(*rel.split("/"))
+        try: st = p.stat()
+        except OSError: res["files"][rel] = "missing"; continue
+        if st.st_size != want.get("size"):
+            res["files"][rel] = f"size mismatch ({st.st_size} != {want.get('size')})"; continue
+        hit = cache.lookup(str(p), st)
+        if hit and hit.get("ino") == st.st_ino:
+            res["cached"] += 1
+            res["files"][rel] = "ok" if hit.get("digest") == want.get("digest") else "digest mismatch"
+        else:
+            to_hash.append((rel, p, st))
+
+    digests = digest_files([p for _, p, _ in to_hash], workers, chunk_bytes) if to_hash else {}
+    for rel, p, st in to_hash:
+        got = digests[str(p)]
+        cache.store(str(p), st.st_size, st.st_mtime_ns, got, {"digest": got, "ino": st.st_ino})
+        res["files"][rel] = "ok" if got == blob["files"][rel].get("digest") else "digest mismatch"
+    res["hashed"] = len(to_hash)
+    cache.save()
+    return res
@@ -6,20 +6,40 @@ WHO=RapidWebDevelop; WHERE=tools/leeway_frontend_audit_plus.py; WHEN=2025-10-04;
 SPDX-License-Identifier: MIT
 """
 
-import argparse, json, os, re, sys
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+import argparse, os, posixpath, re, sys, time
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from leeway_git import ChangedFile, ChangeSet, GitError, base_contents, changed_files
+import leeway_header_fix as header_fix
+from leeway_headers import (
+    DEFAULT_MAX_FILE_BYTES, DEFAULT_MAX_HEADER_LINES, HEADER_RE, MAX_FILE_BYTES_HELP, MAX_HEADER_LINES_HELP,
+    SNIFF_BYTES, has_header, looks_binary, oversize_reason,
+)
+from leeway_id_index import IdIndex
+from leeway_metrics import Metrics, write_trace
+from leeway_report_io import copy_to_stream, write_json, write_ndjson
+from leeway_scan_cache import ScanCache, cache_signature, fingerprint
+from leeway_walk import IgnoreMatcher, Inventory, load_ignore_patterns, walk_files
 
 # ---------- Roots (repo-relative; override via env) ----------
 REPO_ROOT = Path(os.getenv("GITHUB_WORKSPACE") or os.getcwd()).resolve()
 ENV_ROOT = os.getenv("LW_FRONTEND_ROOT")
 DEFAULT_ROOT = (REPO_ROOT / (ENV_ROOT or "frontend")).resolve()
 DEFAULT_OUT  = (DEFAULT_ROOT / "run" / "leeway_frontend_audit_report.json").resolve()
+CACHE_NAME = "leeway_frontend_scan_cache.json"  # lives in <root>/run/
 
-HEADER_RE = re.compile(r"LEEWAY HEADER|LEEWAY MICRO:", re.M)
-DUPLICATE_ID_RE = re.compile(r'id=["\']([^"\']+)["\']')
+# id="x" / id='x', and the JSX forms id={"x"} / id={'x'} / id={`x`}; a template with ${...} is dynamic and skipped.
+# Exactly one group matches, so m[m.lastindex] is the id.
+DUPLICATE_ID_RE = re.compile(r'''id=(?:["']([^"']+)["']|\{\s*(?:["']([^"']+)["']|`([^`$]+)`)\s*\})''')
+# Relative module specifiers (static/dynamic import, re-export, require); feed the per-entry id grouping
+IMPORT_RE = re.compile(r'''(?:\bfrom|\bimport|\brequire)\s*\(?\s*["'](\.{1,2}/[^"']+)["']''')
+NEWLINE_RE = re.compile(r"\n")
+NEWLINE_RE_B = re.compile(rb"\r\n|\r|\n")  # raw bytes keep their own line endings
 
 IMG_REF_RE = re.compile(
     r"""(?:
@@ -29,6 +49,9 @@ IMG_REF_RE = re.compile(
     )""",
     re.IGNORECASE | re.VERBOSE,
 )
+# Bytes prefilter: every IMG_REF_RE match ends in ".ext" + quote, so only those spots are worth a look.
+# ſ/ı/İ are the only non-ASCII characters IGNORECASE folds onto these letters.
+IMG_REF_PREFILTER = re.compile(rb"""\.(?:png|jpe?g|g(?:i|\xc4[\xb0\xb1])f|(?:s|\xc5\xbf)vg|webp)["']""", re.IGNORECASE)
 
 BASE_REQUIRED_IMAGES = [
     "image/macmillionmic.png",
@@ -37,11 +60,17 @@ BASE_REQUIRED_IMAGES = [
 
 SCAN_EXTS_ALL: Set[str] = {".tsx", ".ts", ".jsx", ".js", ".mjs", ".html", ".css", ".md"}
 SCAN_EXTS_IDS: Set[str] = {".html", ".tsx", ".jsx"}
+SCAN_EXTS_IMPORTS: Set[str] = {".tsx", ".ts", ".jsx", ".js", ".mjs"}
 ASSET_EXTS: Set[str] = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp"}
+DEFAULT_ASSET_ROOTS = ["public"]  # root-relative; searched in order
+
+EXECUTORS = ("thread", "process", "serial")
+MAX_CHUNK = 256  # files per shard; small enough to balance, big enough to amortize IPC
 
+# gitignore semantics: a trailing "/" is directory-only and matches at any depth
 DEFAULT_IGNORES = [
-    "node_modules/**", "dist/**", "build/**", ".next/**", ".vercel/**",
-    ".cache/**", "coverage/**", "**/*.map",
+    "node_modules/", "dist/", "build/", ".next/", ".vercel/",
+    ".cache/", "coverage/", "*.map",
 ]
 
 @dataclass
@@ -49,83 +78,628 @@ class Report:
     headers_missing: List[str]
     duplicate_ids: Dict[str, Dict[str, int]]
     duplicate_ids_lines: Dict[str, Dict[str, List[int]]]
+    duplicate_ids_locations: Dict[str, Dict[str, List[List[int]]]]  # [line, column], both 1-based
     required_assets: Dict[str, bool]
     discovered_assets: Dict[str, bool]
+    skipped_files: Dict[str, str]  # path -> reason (binary / oversize); not scanned by any detector
     root: str
     config: Dict[str, str]
+    asset_locations: Dict[str, str] = field(default_factory=dict)  # ref -> root-relative file it resolved to
+    asset_case_mismatches: Dict[str, str] = field(default_factory=dict)  # missing ref -> file differing only in case
+    missing_asset_refs: Dict[str, List[list]] = field(default_factory=dict)  # missing ref -> [[path, line], ...] using it
+    cross_file_duplicate_ids: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)  # id -> {path: [lines]}
+    cross_file_duplicate_ids_by_entry: Dict[str, Dict[str, Dict[str, List[int]]]] = field(default_factory=dict)  # entry -> id -> ...
+    metrics: dict = field(default_factory=dict)  # Metrics.to_dict(); empty for reports not built by audit()
+    header_fixes: Dict[str, str] = field(default_factory=dict)  # path -> fixed / would-fix / skipped: reason
 
-def _load_ignore_patterns(ignore_file: Path, inline_ignores: List[str]) -> List[str]:
-    pats: List[str] = []
-    if ignore_file and ignore_file.exists():
-        pats += [ln.strip() for ln in ignore_file.read_text(encoding="utf-8", errors="ignore").splitlines()
-                 if ln.strip() and not ln.strip().startswith("#")]
-    pats += inline_ignores or []
-    return pats
-
-def _should_ignore(path: Path, root: Path, patterns: List[str]) -> bool:
-    rel = path.relative_to(root).as_posix()
-    for pat in patterns:
-        if Path(rel).match(pat) or ("/" not in pat and Path(path.name).match(pat)):
-            return True
-    return False
+def _list_files(root: Path, exts: Set[str], patterns: List[str], stats: Optional[Dict[str, int]] = None) -> List[Path]:
+    # Ignored directories are pruned during the walk, not filtered afterwards
+    return walk_files(root, IgnoreMatcher(patterns), exts, stats=stats)
+
+def _scoped_files(root: Path, paths: List[Path], exts: Set[str], patterns: List[str]) -> List[Path]:
+    """The walk's answer restricted to `paths` (e.g. a git diff): same extensions, same ignore rules."""
+    matcher = IgnoreMatcher(patterns)
+    return [p for p in paths if p.suffix.lower() in exts and not matcher.ignored_path(p.relative_to(root).as_posix())]
+
+@dataclass
+class FileScan:
+    path: str
+    header: bool
+    dup_ids: Dict[str, List[List[int]]]  # id -> [[line, column], ...]
+    image_refs: List[str]
+    rel_refs: List[str] = field(default_factory=list)  # per image_refs entry: raw "./"/"../" ref, else ""
+    ids: Dict[str, List[int]] = field(default_factory=dict)  # every id -> [lines]; only with cross-file ids on
+    imports: List[str] = field(default_factory=list)  # relative import specifiers; only with cross-file ids on
+    size: int = 0
+    mtime_ns: int = 0
+    fp: str = ""
+    skipped: str = ""
+    ref_lines: List[int] = field(default_factory=list)  # 1-based line of each image_refs entry
+    read_bytes: int = 0  # timings/bytes of this run only; never cached
+    read_s: float = 0.0
+    regex_s: float = 0.0
+
+    def to_cache(self) -> dict:
+        out = {"header": self.header, "dup_ids": self.dup_ids, "image_refs": self.image_refs, "rel_refs": self.rel_refs,
+               "ref_lines": self.ref_lines}
+        if self.ids: out["ids"] = self.ids
+        if self.imports: out["imports"] = self.imports
+        return out
+
+    @classmethod
+    def from_cache(cls, path: str, result: dict, size: int = 0, mtime_ns: int = 0, fp: str = "") -> "FileScan":
+        return cls(path, bool(result.get("header")), result.get("dup_ids") or {}, result.get("image_refs") or [],
+                   result.get("rel_refs") or [], result.get("ids") or {}, result.get("imports") or [], size, mtime_ns, fp,
+                   ref_lines=result.get("ref_lines") or [])
+
+class LineIndex:
+    """
+    Newline offsets of one buffer, built once; `locate()` bisects to a 1-based (line, column).
+    Decoded text is expected with "\n" newlines; for raw bytes, columns count bytes.
+    """
+    __slots__ = ("_nl",)
+
+    def __init__(self, text: Union[str, bytes]):
+        self._nl = [m.start() for m in (NEWLINE_RE if isinstance(text, str) else NEWLINE_RE_B).finditer(text)]
+
+    def locate(self, pos: int) -> Tuple[int, int]:
+        i = bisect_left(self._nl, pos)  # newlines strictly before pos
+        return i + 1, pos - (self._nl[i - 1] + 1 if i else 0) + 1
+
+def _id_starts(text: str) -> Dict[str, List[int]]:
+    starts: Dict[str, List[int]] = {}
+    for m in DUPLICATE_ID_RE.finditer(text):
+        starts.setdefault(m[m.lastindex], []).append(m.start())
+    return starts
+
+def _detect_duplicate_ids(text: str) -> Dict[str, List[List[int]]]:
+    offenders = {k: v for k, v in _id_starts(text).items() if len(v) > 1}
+    if not offenders: return {}
+    idx = LineIndex(text)  # only paid for files that actually have duplicates
+    return {k: [list(idx.locate(pos)) for pos in v] for k, v in offenders.items()}
+
+def _detect_ids(text: str) -> Tuple[Dict[str, List[List[int]]], Dict[str, List[int]]]:
+    """-> (in-file duplicates as _detect_duplicate_ids, every id -> [lines]) from one regex pass."""
+    starts = _id_starts(text)
+    if not starts: return {}, {}
+    idx = LineIndex(text)
+    dups = {k: [list(idx.locate(pos)) for pos in v] for k, v in starts.items() if len(v) > 1}
+    return dups, {k: [idx.locate(pos)[0] for pos in v] for k, v in starts.items()}
+
+def _detect_imports(text: str) -> List[str]:
+    return list(dict.fromkeys(m.group(1) for m in IMPORT_RE.finditer(text)))
+
+def _asset_ref(rel: Optional[str]) -> Optional[str]:
+    if not rel: return None
+    rel = rel.lstrip("./").lstrip("/")
+    return rel if Path(rel).suffix.lower() in ASSET_EXTS else None
+
+def _ref_groups(text: str) -> Iterator[str]:
+    return (raw for raw, _ in _ref_hits(text))
 
-def _list_files(root: Path, exts: Set[str], patterns: List[str]) -> List[Path]:
-    files: List[Path] = []
-    for p in root.rglob("*"):
-        if p.is_file() and p.suffix.lower() in exts and not _should_ignore(p, root, patterns):
-            files.append(p)
-    return files
+def _ref_hits(text: str) -> Iterator[Tuple[str, int]]:
+    """(raw ref, offset of the ref) per IMG_REF_RE match."""
+    for m in IMG_REF_RE.finditer(text):
+        g = "a" if m.group("a") else "b" if m.group("b") else "c"
+        yield m.group(g), m.start(g)
 
-def _top_n_lines(text: str, n: int) -> str:
-    if n <= 0: return text
-    return "\n".join(text.splitlines()[:n])
+def _detect_image_refs(text: str) -> List[str]:
+    return [rel for rel in map(_asset_ref, _ref_groups(text)) if rel]
 
-def _scan_headers(files: List[Path], max_header_lines: int) -> List[str]:
-    missing: List[str] = []
+def _detect_image_refs_bytes(data: bytes) -> List[str]:
+    return [rel for rel in map(_asset_ref, _ref_groups_bytes(data)) if rel]
+
+def _ref_groups_bytes(data: bytes) -> Iterator[str]:
+    return (raw for raw, _ in _ref_hits_bytes(data))
+
+def _ref_hits_bytes(data: bytes) -> Iterator[Tuple[str, int]]:
+    """
+    (raw ref, byte offset) with the same groups in the same order as _ref_hits(data.decode()) for valid UTF-8, without
+    decoding the file or trying the alternation at every quote. Each prefilter hit is widened back
+    to the nearest quote; that window is what IMG_REF_RE's catch-all branch would match there (the
+    src=/import branches only add quote-free text in front of the same window). A quote that closed
+    the previous ref cannot open the next one, exactly as with finditer.
+    """
+    consumed = -1
+    for m in IMG_REF_PREFILTER.finditer(data):
+        dot, close = m.start(), m.end() - 1
+        start = max(data.rfind(b'"', 0, dot), data.rfind(b"'", 0, dot))
+        if start < 0 or start == consumed: continue
+        window = data[start:close + 1].decode("utf-8")
+        if "\r" in window: window = window.replace("\r\n", "\n").replace("\r", "\n")
+        hit = IMG_REF_RE.fullmatch(window)
+        if not hit: continue
+        consumed = close
+        yield hit.group("c"), start + 1
+
+def _refs_in(data: bytes) -> Set[str]:
+    try: data.decode("utf-8")
+    except UnicodeDecodeError:
+        return set(_detect_image_refs(data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")))
+    return set(_detect_image_refs_bytes(data))
+
+def _added_refs_only(scans: List[FileScan], changes: ChangeSet, scope: List[ChangedFile]) -> List[FileScan]:
+    """Drop image refs a changed file already had at the base commit; new files keep all of theirs."""
+    by_path = {str(f.path): f for f in scope}
+    before = base_contents(changes, [by_path[s.path] for s in scans if s.path in by_path])
+    out: List[FileScan] = []
+    for s in scans:
+        if s.path not in before: out.append(s); continue
+        old = _refs_in(before[s.path])
+        kept = [(r, ln) for r, ln in zip(s.image_refs, s.ref_lines) if r not in old]
+        out.append(replace(s, image_refs=[r for r, _ in kept], ref_lines=[ln for _, ln in kept],
+                           rel_refs=[r for r, ref in zip(s.rel_refs, s.image_refs) if ref not in old]))
+    return out
+
+def _scan_file(p: Path, max_header_lines: int, prior: Optional[dict] = None,
+               max_file_bytes: int = DEFAULT_MAX_FILE_BYTES, collect_ids: bool = False) -> FileScan:
+    """
+    Read + decode once, then run every detector on the same buffer.
+    `prior` is the stale cache entry (stat changed); an unchanged fingerprint reuses its result.
+    Oversized files are never read and binary files are read no further than the sniff block;
+    both come back as `skipped`.
+    `collect_ids` also records every id and relative import, for the cross-file id index.
+    """
+    t0 = time.perf_counter()
+    try:
+        with open(p, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            reason = oversize_reason(st.st_size, max_file_bytes)
+            if reason: return FileScan(str(p), True, {}, [], skipped=reason)
+            head = fh.read(SNIFF_BYTES)
+            if looks_binary(head):  # the rest of a binary file is never read
+                return FileScan(str(p), True, {}, [], skipped="binary", read_bytes=len(head),
+                                read_s=time.perf_counter() - t0)
+            data = head + fh.read()
+    except Exception: return FileScan(str(p), False, {}, [])
+    t1 = time.perf_counter()
+    fp = fingerprint(data)
+    if prior and prior.get("fp") == fp:
+        s = FileScan.from_cache(str(p), prior["result"], st.st_size, st.st_mtime_ns, fp)
+        s.read_bytes, s.read_s = len(data), t1 - t0
+        return s
+    try: text, valid = data.decode("utf-8"), True
+    except UnicodeDecodeError: text, valid = data.decode("utf-8", errors="ignore"), False
+    if "\r" in text: text = text.replace("\r\n", "\n").replace("\r", "\n")  # match text-mode newlines
+    ext = p.suffix.lower()
+    ids: Dict[str, List[int]] = {}
+    if ext not in SCAN_EXTS_IDS: dup_ids = {}
+    elif collect_ids: dup_ids, ids = _detect_ids(text)
+    else: dup_ids = _detect_duplicate_ids(text)
+    imports = _detect_imports(text) if collect_ids and ext in SCAN_EXTS_IMPORTS else []
+    # Dropped invalid bytes could join an extension back together, so those files take the str path
+    refs: List[str] = []
+    rel_refs: List[str] = []
+    ref_lines: List[int] = []
+    lines: Optional[LineIndex] = None
+    for raw, pos in (_ref_hits_bytes(data) if valid else _ref_hits(text)):
+        rel = _asset_ref(raw)
+        if not rel: continue
+        if lines is None: lines = LineIndex(data if valid else text)  # only for files with refs
+        refs.append(rel); ref_lines.append(lines.locate(pos)[0])
+        rel_refs.append(raw if raw.startswith(("./", "../")) else "")
+    s = FileScan(str(p), has_header(text, max_header_lines), dup_ids, refs, rel_refs, ids, imports,
+                 st.st_size, st.st_mtime_ns, fp, ref_lines=ref_lines)
+    s.read_bytes, s.read_s, s.regex_s = len(data), t1 - t0, time.perf_counter() - t1
+    return s
+
+def _cache_signature(max_header_lines: int, max_file_bytes: int, collect_ids: bool = False) -> str:
+    # Entries written without ids would look id-free to a cross-file run, so the mode is part of the key
+    extra = ("ids", IMPORT_RE.pattern, sorted(SCAN_EXTS_IMPORTS)) if collect_ids else ()
+    return cache_signature(
+        HEADER_RE.pattern, DUPLICATE_ID_RE.pattern, IMG_REF_RE.pattern, IMG_REF_RE.flags,
+        sorted(SCAN_EXTS_IDS), sorted(ASSET_EXTS), max_header_lines, max_file_bytes, "dup_ids=locations", "rel_refs=aligned",
+        "ref_lines", *extra,
+    )
+
+def _scan_chunk(chunk: List[Tuple[str, Optional[dict]]], max_header_lines: int, max_file_bytes: int,
+                collect_ids: bool = False) -> List[FileScan]:
+    # Top-level so ProcessPoolExecutor can pickle it
+    return [_scan_file(Path(p), max_header_lines, prior, max_file_bytes, collect_ids) for p, prior in chunk]
+
+def _shard(items: list, workers: int) -> List[list]:
+    size = max(1, min(MAX_CHUNK, -(-len(items) // (max(1, workers) * 4))))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _run_sharded(fn: Callable[[list], list], chunks: List[list], workers: int, executor: str,
+                 pool: Optional[Executor] = None) -> List[list]:
+    """
+    Results come back in chunk order whatever the executor, so merges are deterministic.
+    A caller-owned `pool` (e.g. shared by the combined audit) takes precedence over `executor`.
+    """
+    if pool is not None and len(chunks) > 1:
+        return list(pool.map(fn, chunks))
+    if executor == "serial" or len(chunks) <= 1:
+        return [fn(c) for c in chunks]
+    if executor == "process":
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as ex:
+            return list(ex.map(fn, chunks))
+    with ThreadPoolExecutor(max_workers=max(2, workers)) as ex:
+        return list(ex.map(fn, chunks))
+
+def _scan_files(files: List[Path], max_header_lines: int, workers: int, cache: ScanCache,
+                executor: str = "thread", max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                pool: Optional[Executor] = None, metrics: Optional[Metrics] = None,
+                id_index: Optional[IdIndex] = None) -> List[FileScan]:
+    """
+    Stat-only cache hits stay in-process; misses are sharded to the executor. Output keeps `files` order.
+    With `id_index`, ids and imports are collected and each scan is added to the index as it arrives.
+    """
+    def index(s: FileScan):
+        if id_index is None or not (s.ids or s.imports): return
+        id_index.add(s.path, s.ids, s.imports)
+        s.ids, s.imports = {}, []  # the index holds them compactly from here on
+
+    scans: Dict[str, FileScan] = {}
+    pending: List[Path] = []
     for p in files:
-        try: text = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception: missing.append(str(p)); continue
-        hay = _top_n_lines(text, max_header_lines) if max_header_lines else text
-        if not HEADER_RE.search(hay): missing.append(str(p))
-    return sorted(missing)
+        key = str(p)
+        try: st = p.stat()
+        except OSError: pending.append(p); continue
+        hit = cache.lookup(key, st)
+        if hit is None: pending.append(p)
+        else: scans[key] = FileScan.from_cache(key, hit); index(scans[key])
 
-def _scan_duplicate_ids(files: List[Path]) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[str, List[int]]]]:
+    jobs = [(str(p), cache.prior(str(p))) for p in pending]
+    scan = partial(_scan_chunk, max_header_lines=max_header_lines, max_file_bytes=max_file_bytes,
+                   collect_ids=id_index is not None)
+    for batch in _run_sharded(scan, _shard(jobs, workers), workers, executor, pool):
+        for s in batch:
+            scans[s.path] = s
+            cache.store(s.path, s.size, s.mtime_ns, s.fp, s.to_cache())
+            index(s)
+            if metrics:
+                metrics.count("bytes_read", s.read_bytes)
+                metrics.add_worker_time("read", s.read_s)
+                metrics.add_worker_time("regex", s.regex_s)
+                metrics.file_time(s.path, s.read_s + s.regex_s)
+    cache.save()
+    if metrics:
+        metrics.count("files_scanned", len(pending))
+        metrics.count("cache_hits", len(files) - len(pending))
+    return [scans[str(p)] for p in files]
+
+def _merge_scans(scans: List[FileScan]):
+    """-> (headers_missing, dup counts, dup lines, dup [line, col] locations, discovered refs, skipped)"""
+    headers_missing: List[str] = []
     counts_all: Dict[str, Dict[str, int]] = {}
     lines_all: Dict[str, Dict[str, List[int]]] = {}
-    for p in files:
-        try: text = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception: continue
-        local_counts: Dict[str, int] = {}
-        local_lines: Dict[str, List[int]] = {}
-        for m in DUPLICATE_ID_RE.finditer(text):
-            _id = m.group(1)
-            local_counts[_id] = local_counts.get(_id, 0) + 1
-            line_no = text.count("\n", 0, m.start()) + 1
-            local_lines.setdefault(_id, []).append(line_no)
-        offenders = {k: v for k, v in local_counts.items() if v > 1}
-        if offenders:
-            counts_all[str(p)] = offenders
-            lines_all[str(p)] = {k: local_lines.get(k, []) for k in offenders.keys()}
-    return counts_all, lines_all
-
-def _discover_image_refs(files: List[Path]) -> List[str]:
-    refs = set()
-    for p in files:
-        try: text = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception: continue
-        for m in IMG_REF_RE.finditer(text):
-            rel = m.group("a") or m.group("b") or m.group("c")
-            if not rel: continue
-            rel = rel.lstrip("./").lstrip("/")
-            if Path(rel).suffix.lower() in ASSET_EXTS:
-                refs.add(rel)
-    return sorted(refs)
-
-def _check_assets(public_dir: Path, rels: List[str]) -> Dict[str, bool]:
+    locs_all: Dict[str, Dict[str, List[List[int]]]] = {}
+    refs: Set[str] = set()
+    skipped: Dict[str, str] = {}
+    for s in scans:
+        if s.skipped: skipped[s.path] = s.skipped; continue
+        if not s.header: headers_missing.append(s.path)
+        if s.dup_ids:
+            counts_all[s.path] = {k: len(v) for k, v in s.dup_ids.items()}
+            lines_all[s.path] = {k: [loc[0] for loc in v] for k, v in s.dup_ids.items()}
+            locs_all[s.path] = s.dup_ids
+        refs.update(s.image_refs)
+    return sorted(headers_missing), counts_all, lines_all, locs_all, sorted(refs), skipped
+
+def _sarif_uri(path: str, root: Path) -> Dict[str, str]:
+    try: return {"uri": Path(path).relative_to(root).as_posix(), "uriBaseId": "SRCROOT"}
+    except ValueError: return {"uri": Path(path).as_uri()}
+
+def _to_sarif(report: "Report") -> dict:
+    """SARIF 2.1.0 log: duplicate IDs carry line/column regions; headers and assets are file/artifact level."""
+    root = Path(report.root)
+    rules = [
+        {"id": "LW001", "name": "MissingLeewayHeader", "shortDescription": {"text": "LEEWAY header missing"}},
+        {"id": "LW002", "name": "DuplicateElementId", "shortDescription": {"text": "Element id repeated within a file"}},
+        {"id": "LW003", "name": "MissingAsset", "shortDescription": {"text": "Referenced image not found under /public"}},
+        {"id": "LW004", "name": "CrossFileDuplicateId", "shortDescription": {"text": "Element id used by more than one file"}},
+    ]
+    results: List[dict] = []
+    for path in report.headers_missing:
+        results.append({"ruleId": "LW001", "level": "warning",
+                        "message": {"text": "LEEWAY HEADER / LEEWAY MICRO: not found in file header"},
+                        "locations": [{"physicalLocation": {"artifactLocation": _sarif_uri(path, root)}}]})
+    for path, ids in report.duplicate_ids_locations.items():
+        for _id, locs in ids.items():
+            for line, col in locs:
+                results.append({"ruleId": "LW002", "level": "error",
+                                "message": {"text": f'id="{_id}" appears {len(locs)} times in this file'},
+                                "locations": [{"physicalLocation": {
+                                    "artifactLocation": _sarif_uri(path, root),
+                                    "region": {"startLine": line, "startColumn": col},
+                                }}]})
+    for entry, _id, files in _cross_file_hits(report):
+        where = f" (entry {_sarif_uri(entry, root)['uri']})" if entry else ""
+        results.append({"ruleId": "LW004", "level": "error",
+                        "message": {"text": f'id="{_id}" is used by {len(files)} files{where}'},
+                        "locations": [{"physicalLocation": {"artifactLocation": _sarif_uri(path, root),
+                                                            "region": {"startLine": line}}}
+                                      for path, lines in files.items() for line in lines]})
+    for kind, status in (("required", report.required_assets), ("discovered", report.discovered_assets)):
+        for rel, ok in status.items():
+            if ok: continue
+            alt = report.asset_case_mismatches.get(rel)
+            text = f"{kind} asset not found: public/{rel}" + (f" (case differs: {alt})" if alt else "")
+            # Code scanning drops results without a location: one result per referencing line, or for a
+            # required asset (nothing references it) the path where it is expected
+            refs = report.missing_asset_refs.get(rel) if kind == "discovered" else None
+            for path, line in refs or [(str(root / "public" / rel), 0)]:
+                loc = {"artifactLocation": _sarif_uri(path, root), **({"region": {"startLine": line}} if line else {})}
+                results.append({"ruleId": "LW003", "level": "error", "message": {"text": text},
+                                "locations": [{"physicalLocation": loc}]})
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "leeway-frontend-audit", "rules": rules}},
+            "originalUriBaseIds": {"SRCROOT": {"uri": root.as_uri() + "/"}},
+            "columnKind": "unicodeCodePoints",
+            "results": results,
+        }],
+    }
+
+def _cross_file_hits(report: "Report") -> Iterator[Tuple[str, str, Dict[str, List[int]]]]:
+    """(entry or "", id, {path: [lines]}) for repo-wide and per-entry collisions alike."""
+    for _id, files in report.cross_file_duplicate_ids.items():
+        yield "", _id, files
+    for entry, ids in report.cross_file_duplicate_ids_by_entry.items():
+        for _id, files in ids.items():
+            yield entry, _id, files
+
+def iter_findings(report: "Report") -> Iterator[dict]:
+    """One flat record per finding, for NDJSON consumers; generated lazily from the report."""
+    for path in report.headers_missing:
+        yield {"audit": "frontend", "check": "header", "path": path}
+    for path, ids in report.duplicate_ids_locations.items():
+        for _id, locs in ids.items():
+            for line, col in locs:
+                yield {"audit": "frontend", "check": "duplicate_id", "path": path, "id": _id, "line": line, "column": col}
+    for entry, _id, files in _cross_file_hits(report):
+        rec = {"audit": "frontend", "check": "cross_file_duplicate_id", "id": _id,
+               "locations": [[path, line] for path, lines in files.items() for line in lines]}
+        if entry: rec["entry"] = entry
+        yield rec
+    for kind, status in (("required", report.required_assets), ("discovered", report.discovered_assets)):
+        for rel, ok in status.items():
+            if ok: continue
+            rec = {"audit": "frontend", "check": "asset", "kind": kind, "asset": rel}
+            if rel in report.asset_case_mismatches: rec["case_mismatch"] = report.asset_case_mismatches[rel]
+            if kind == "discovered" and rel in report.missing_asset_refs: rec["locations"] = report.missing_asset_refs[rel]
+            yield rec
+    for path, reason in report.skipped_files.items():
+        yield {"audit": "frontend", "check": "skipped", "path": path, "reason": reason}
+
+class AssetIndex:
+    """
+    In-memory answers for asset lookups. Each asset root is walked once, without ignore rules,
+    so lookups agree with the per-ref exists() this replaces: a ref the inventory misses is
+    still stat()ed, so a case-insensitive disk accepts it as before. With `case_sensitive`
+    (--check-case) that fallback is off and "Logo.PNG" for logo.png misses on every host.
+    Directories holding "./" / "../" targets are listed lazily, once each.
+    Locations are root-relative POSIX paths.
+    """
+
+    def __init__(self, root: Path, asset_roots: Optional[List[str]] = None, case_sensitive: bool = False):
+        self.root = root
+        self.case_sensitive = case_sensitive
+        self.asset_roots = [(r.strip("/"), Inventory.build(root / r, IgnoreMatcher([])))
+                            for r in (asset_roots or DEFAULT_ASSET_ROOTS)]
+        self._folded: Optional[Dict[str, str]] = None
+        self._listings: Dict[str, Set[str]] = {}
+
+    def find(self, rel: str) -> Optional[str]:
+        if posixpath.normpath(rel) != rel:  # "a/../b.png", "a//b.png": rare, let the OS resolve them
+            for label, _ in self.asset_roots:
+                if (self.root / label / rel).exists(): return posixpath.normpath(posixpath.join(label, rel))
+            return None
+        for label, inv in self.asset_roots:
+            if inv.exists(rel): return posixpath.join(label, rel)
+        if not self.case_sensitive:
+            for label, _ in self.asset_roots:
+                if (self.root / label / rel).exists(): return posixpath.join(label, rel)
+        return None
+
+    def find_case(self, rel: str) -> Optional[str]:
+        """Location of a file whose path equals `rel` ignoring case (first asset root wins)."""
+        if self._folded is None:
+            self._folded = {}
+            for label, inv in reversed(self.asset_roots):
+                self._folded.update({f.lower(): posixpath.join(label, f) for f in inv.files})
+        return self._folded.get(posixpath.normpath(rel).lower())
+
+    def resolve_relative(self, source: str, raw: str) -> Optional[str]:
+        """`raw` ("./x.png", "../img/x.png") relative to the referencing file's directory."""
+        try: src_dir = posixpath.dirname(Path(source).relative_to(self.root).as_posix())
+        except ValueError: return None
+        target = posixpath.normpath(posixpath.join(src_dir, raw))
+        if target == ".." or target.startswith("../"): return None
+        d, name = posixpath.split(target)
+        if d not in self._listings:
+            try: self._listings[d] = set(os.listdir(self.root / d))
+            except OSError: self._listings[d] = set()
+        if name in self._listings[d]: return target
+        return target if not self.case_sensitive and (self.root / target).exists() else None
+
+def _check_assets(index: AssetIndex, rels: List[str], locations: Optional[Dict[str, str]] = None,
+                  mismatches: Optional[Dict[str, str]] = None) -> Dict[str, bool]:
+    """Resolved in memory; found refs go to `locations`, case-only misses to `mismatches` (when given)."""
     out: Dict[str, bool] = {}
-    for rel in rels: out[rel] = (public_dir / rel).exists()
+    for rel in rels:
+        loc = index.find(rel)
+        out[rel] = loc is not None
+        if loc is not None:
+            if locations is not None: locations[rel] = loc
+        elif mismatches is not None:
+            alt = index.find_case(rel)
+            if alt: mismatches[rel] = alt
     return out
 
+def _build_report(root: Path, scans: List[FileScan], require_images: List[str], config: Dict[str, str],
+                  metrics: Optional[Metrics] = None, asset_roots: Optional[List[str]] = None,
+                  resolve_relative: bool = False, check_case: bool = False, check_required: bool = True) -> Report:
+    metrics = metrics or Metrics("frontend")
+    with metrics.phase("merge"):
+        headers_missing, dup_counts, dup_lines, dup_locs, discovered_refs, skipped = _merge_scans(scans)
+    required_images = BASE_REQUIRED_IMAGES + list(dict.fromkeys(require_images or [])) if check_required else []
+    locations: Dict[str, str] = {}
+    mismatches: Dict[str, str] = {}
+    with metrics.phase("asset_index"):
+        index = AssetIndex(root, asset_roots, case_sensitive=check_case)
+    with metrics.phase("assets"):
+        case = mismatches if check_case else None
+        required = _check_assets(index, required_images, locations, case)
+        discovered = _check_assets(index, discovered_refs, locations, case)
+        # "../img/x.png" means a different file in every directory: resolve each occurrence from its own
+        # source, and count the ref as found only when no occurrence misses
+        missing_refs: Dict[str, List[list]] = {}
+        resolved: Dict[str, str] = {}
+        for s in scans:
+            for rel, line, raw in zip(s.image_refs, s.ref_lines, s.rel_refs):
+                if discovered.get(rel) is not False: continue
+                loc = index.resolve_relative(s.path, raw) if resolve_relative and raw else None
+                if loc: resolved.setdefault(rel, loc)
+                else: missing_refs.setdefault(rel, []).append([s.path, line])
+        for rel, loc in resolved.items():
+            if rel not in missing_refs: discovered[rel] = True; locations[rel] = loc; mismatches.pop(rel, None)
+    metrics.count("asset_files_indexed", sum(len(inv.files) for _, inv in index.asset_roots))
+    metrics.count("asset_dirs_listed", len(index._listings))
+    metrics.count("image_refs", sum(len(s.image_refs) for s in scans))
+    metrics.count("duplicate_id_hits", sum(len(v) for s in scans for v in s.dup_ids.values()))
+    return Report(
+        headers_missing=headers_missing,
+        duplicate_ids=dup_counts,
+        duplicate_ids_lines=dup_lines,
+        duplicate_ids_locations=dup_locs,
+        required_assets=required,
+        discovered_assets=discovered,
+        skipped_files=skipped,
+        root=str(root),
+        config=config,
+        asset_locations=dict(sorted(locations.items())),
+        asset_case_mismatches=dict(sorted(mismatches.items())),
+        missing_asset_refs=dict(sorted(missing_refs.items())),
+    )
+
+def _touching(collisions: Dict[str, Dict[str, List[int]]], paths: Optional[Set[str]]) -> Dict[str, Dict[str, List[int]]]:
+    """Collisions with at least one file in `paths` (all of them when `paths` is None)."""
+    if paths is None: return collisions
+    return {k: v for k, v in collisions.items() if not paths.isdisjoint(v)}
+
+def _id_collisions(root: Path, id_index: IdIndex, id_entries: Optional[List[str]],
+                   focus: Optional[Set[str]] = None) -> Tuple[Dict[str, Dict[str, List[int]]], Dict[str, dict]]:
+    """(repo-wide, per-entry) cross-file id collisions; only one is filled, per-entry when `id_entries`."""
+    if not id_entries: return _touching(id_index.collisions(), focus), {}
+    by_entry: Dict[str, dict] = {}
+    for entry, hits in id_index.collisions_by_entry(root, id_entries).items():
+        hits = _touching(hits, focus)
+        if hits: by_entry[entry] = hits
+    return {}, by_entry
+
+def _strict_failed(report: Report, strict: str) -> bool:
+    if not strict: return False
+    def any_missing(d: Dict[str, bool]) -> bool: return any(not ok for ok in d.values())
+    wants_headers = strict in ("all", "headers")
+    wants_ids     = strict in ("all", "ids")
+    wants_assets  = strict in ("all", "assets")
+    if wants_headers and report.headers_missing: return True
+    if wants_ids     and (report.duplicate_ids or report.cross_file_duplicate_ids
+                          or report.cross_file_duplicate_ids_by_entry): return True
+    if wants_assets  and (any_missing(report.required_assets) or any_missing(report.discovered_assets)): return True
+    return False
+
+def audit(
+    root: Path,
+    ignore_file: Optional[Path],
+    inline_ignores: List[str],
+    require_images: List[str],
+    max_header_lines: int,
+    workers: int,
+    use_cache: bool = True,
+    executor: str = "thread",
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    pool: Optional[Executor] = None,
+    config: Optional[Dict[str, str]] = None,
+    metrics: Optional[Metrics] = None,
+    asset_roots: Optional[List[str]] = None,
+    resolve_relative: bool = False,
+    check_case: bool = False,
+    changes: Optional[ChangeSet] = None,
+    repo_checks: bool = True,
+    cross_file_ids: bool = False,
+    id_entries: Optional[List[str]] = None,
+) -> Tuple[Report, List[str], ScanCache]:
+    """
+    Walk + scan + assemble, no output. -> (report, ignore patterns, cache); timings land in report.metrics.
+    With `changes` only the changed files under root are scanned, only refs they add are checked,
+    and required assets are skipped unless `repo_checks`.
+    `cross_file_ids` indexes every id in the tree and reports ids used by 2+ files, repo-wide or, with
+    `id_entries` (gitignore-style globs), per entry file and the files it imports. When scoped, the whole
+    tree is still indexed, but only collisions that involve a changed file are reported.
+    """
+    metrics = metrics or Metrics("frontend")
+    patterns = load_ignore_patterns(ignore_file, inline_ignores)
+    scope = changes.under(root) if changes else None
+    id_index = IdIndex() if cross_file_ids or id_entries else None
+    with metrics.phase("walk"):
+        if scope is None: files_all = _list_files(root, SCAN_EXTS_ALL, patterns, stats=metrics.counters)
+        else: files_all = _scoped_files(root, [f.path for f in scope], SCAN_EXTS_ALL, patterns)
+        files_scan = files_all
+        if scope is not None and id_index is not None:
+            files_scan = _list_files(root, SCAN_EXTS_ALL, patterns, stats=metrics.counters)
+    cache_path = root / "run" / CACHE_NAME if use_cache else None
+    with metrics.phase("cache_load"):
+        # A partial run must not evict the entries of files it did not look at
+        cache = ScanCache.load(cache_path, _cache_signature(max_header_lines, max_file_bytes, id_index is not None),
+                               prune=scope is None)
+
+    # One read per file; all detectors share the decoded buffer
+    with metrics.phase("scan"):
+        scans = _scan_files(files_scan, max_header_lines, workers, cache, executor, max_file_bytes, pool, metrics,
+                            id_index)
+    if scope is not None:
+        with metrics.phase("base_refs"):
+            if files_scan is not files_all:
+                wanted = {str(p) for p in files_all}
+                scans = [s for s in scans if s.path in wanted]
+            scans = _added_refs_only(scans, changes, scope)
+    asset_roots = asset_roots or DEFAULT_ASSET_ROOTS
+    scoped = {"changed_since": changes.ref, "changed_base": changes.base, "changed_files": str(len(files_all)),
+              "repo_checks": str(repo_checks).lower()} if changes else {}
+    report = _build_report(root, scans, require_images, metrics=metrics, asset_roots=asset_roots,
+                           resolve_relative=resolve_relative, check_case=check_case,
+                           check_required=scope is None or repo_checks, config={
+        "ignore_file": str(ignore_file) if ignore_file else "",
+        **(config or {}),
+        "max_header_lines": str(max_header_lines),
+        "max_file_bytes": str(max_file_bytes),
+        "workers": str(workers),
+        "cache": str(cache_path) if cache_path else "off",
+        "asset_roots": ",".join(asset_roots),
+        "resolve_relative": str(resolve_relative).lower(),
+        "check_case": str(check_case).lower(),
+        **scoped,
+        **({"cross_file_ids": "true", "id_entries": ",".join(id_entries or [])} if id_index is not None else {}),
+    })
+    if id_index is not None:
+        with metrics.phase("id_collisions"):
+            focus = {s.path for s in scans} if scope is not None else None
+            report.cross_file_duplicate_ids, report.cross_file_duplicate_ids_by_entry = _id_collisions(
+                root, id_index, id_entries, focus)
+        for k, v in id_index.stats().items(): metrics.count(k, v)
+    report.metrics = metrics.to_dict()
+    return report, patterns, cache
+
+def fix_report_headers(root: Path, report: Report, template: header_fix.HeaderTemplate, dry_run: bool,
+                       metrics: Metrics, workers: int = os.cpu_count() or 4, pool: Optional[Executor] = None,
+                       max_header_lines: int = DEFAULT_MAX_HEADER_LINES) -> List[header_fix.HeaderFix]:
+    """
+    --fix-headers on the files the scan flagged (no second walk). Fixed files leave headers_missing,
+    so the report describes the tree as it now is; header_fixes records every outcome.
+    """
+    with metrics.phase("fix_headers"):
+        fixes = header_fix.fix_headers(root, report.headers_missing, template, dry_run, workers, pool, max_header_lines)
+    report.header_fixes = header_fix.outcomes(fixes)
+    report.headers_missing = [p for p in report.headers_missing if report.header_fixes.get(p) != "fixed"]
+    report.metrics = metrics.to_dict()
+    if dry_run: header_fix.write_diff(root / "run" / header_fix.DIFF_NAME, fixes)
+    return fixes
+
 def run(
     root: Path,
     out: Path,
@@ -136,88 +710,147 @@ def run(
     require_images: List[str],
     max_header_lines: int,
     workers: int,
+    use_cache: bool = True,
+    executor: str = "thread",
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    quiet: bool = False,
+    ndjson: Optional[Path] = None,
+    trace: Optional[Path] = None,
+    asset_roots: Optional[List[str]] = None,
+    resolve_relative: bool = False,
+    check_case: bool = False,
+    changed_since: str = "",
+    repo_checks: bool = False,
+    cross_file_ids: bool = False,
+    id_entries: Optional[List[str]] = None,
+    fix_headers: bool = False,
+    dry_run: bool = False,
+    header_template: Optional[Path] = None,
 ):
-    patterns = _load_ignore_patterns(ignore_file, inline_ignores)
-    public_dir = root / "public"
-    files_all = _list_files(root, SCAN_EXTS_ALL, patterns)
-    files_ids = [p for p in files_all if p.suffix.lower() in SCAN_EXTS_IDS]
-
-    with ThreadPoolExecutor(max_workers=max(2, workers)) as ex:
-        fut_hdr = ex.submit(_scan_headers, files_all, max_header_lines)
-        fut_ids = ex.submit(_scan_duplicate_ids, files_ids)
-        fut_ref = ex.submit(_discover_image_refs, files_all)
-        headers_missing = fut_hdr.result()
-        dup_counts, dup_lines = fut_ids.result()
-        discovered_refs = fut_ref.result()
-
-    required_images = BASE_REQUIRED_IMAGES + list(dict.fromkeys(require_images or []))
-    required_status = _check_assets(public_dir, required_images)
-    discovered_status = _check_assets(public_dir, discovered_refs)
-
-    report = Report(
-        headers_missing=headers_missing,
-        duplicate_ids=dup_counts,
-        duplicate_ids_lines=dup_lines,
-        required_assets=required_status,
-        discovered_assets=discovered_status,
-        root=str(root),
-        config={
-            "ignore_file": str(ignore_file) if ignore_file else "",
-            "strict": strict or "",
-            "format": fmt,
-            "max_header_lines": str(max_header_lines),
-            "workers": str(workers),
-        },
+    try: changes = changed_files(root, changed_since) if changed_since else None
+    except GitError as e:
+        print(f"--changed-since: {e}", file=sys.stderr); sys.exit(2)
+    try: template = header_fix.HeaderTemplate.load(header_template, "frontend") if fix_headers else None
+    except ValueError as e:
+        print(f"--fix-headers: {e}", file=sys.stderr); sys.exit(2)
+    metrics = Metrics("frontend")
+    report, patterns, cache = audit(
+        root, ignore_file, inline_ignores, require_images, max_header_lines, workers,
+        use_cache, executor, max_file_bytes, config={"strict": strict or "", "format": fmt}, metrics=metrics,
+        asset_roots=asset_roots, resolve_relative=resolve_relative, check_case=check_case,
+        changes=changes, repo_checks=repo_checks, cross_file_ids=cross_file_ids, id_entries=id_entries,
     )
+    if template is not None:
+        fixes = fix_report_headers(root, report, template, dry_run, metrics, workers, max_header_lines=max_header_lines)
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(report.__dict__, indent=2), encoding="utf-8")
+    # Runs after report.metrics was captured, so "write" only shows up in the trace
+    with metrics.phase("write"):
+        write_json(out, report.__dict__)
+        if ndjson: write_ndjson(ndjson, iter_findings(report))
+        if fmt == "sarif":
+            sarif_out = out.with_suffix(".sarif")
+            write_json(sarif_out, _to_sarif(report))
+    if trace: write_trace(trace, metrics)
 
-    if fmt == "json":
-        print(json.dumps(report.__dict__, indent=2))
+    if quiet:
+        print(f"leeway frontend: headers_missing={len(report.headers_missing)} dup_id_files={len(report.duplicate_ids)} "
+              f"cross_file_ids={sum(1 for _ in _cross_file_hits(report))} "
+              f"missing_assets={sum(1 for d in (report.required_assets, report.discovered_assets) for ok in d.values() if not ok)} "
+              f"skipped={len(report.skipped_files)} report={out}", file=sys.stderr if fmt == "sarif" else sys.stdout)
+    elif fmt == "json":
+        copy_to_stream(out)
+    elif fmt == "sarif":
+        copy_to_stream(sarif_out)
     else:
-        miss_req = [k for k, ok in required_status.items() if not ok]
-        miss_disc = [k for k, ok in discovered_status.items() if not ok]
+        miss_req = [k for k, ok in report.required_assets.items() if not ok]
+        miss_disc = [k for k, ok in report.discovered_assets.items() if not ok]
         print("\n=== LEEWAY FRONTEND AUDIT (PLUS) ===")
         print(f"root: {root}")
+        if changes: print(f"changed since {changed_since} ({changes.base[:12]}): {report.config['changed_files']} file(s) scanned")
         print(f"ignored patterns: {len(patterns)}")
-        print(f"headers missing: {len(headers_missing)} file(s)")
-        print(f"files with duplicate IDs: {len(dup_counts)}")
+        print(f"headers missing: {len(report.headers_missing)} file(s)")
+        print(f"files with duplicate IDs: {len(report.duplicate_ids)}")
+        hits = list(_cross_file_hits(report))
+        if hits or report.config.get("cross_file_ids"): print(f"ids used by more than one file: {len(hits)}")
+        for entry, _id, files in hits[:10]:
+            print(f"  id=\"{_id}\"" + (f" [{entry}]" if entry else "") + ": " +
+                  ", ".join(f"{path}:{','.join(map(str, lines))}" for path, lines in files.items()))
+        if len(hits) > 10: print(f"  ... (+{len(hits)-10} more)")
+        if report.skipped_files: print(f"skipped (binary/oversize): {len(report.skipped_files)} file(s)")
+        if cache.enabled: print("cache: {hits} hit(s), {misses} miss(es)".format(**cache.stats()))
         if miss_req:  print(f"missing required assets: {', '.join(miss_req)}")
+        if report.asset_case_mismatches: print(f"case-mismatched assets: {len(report.asset_case_mismatches)}")
         if miss_disc: print(f"missing discovered assets: {', '.join(miss_disc[:10])}" + (f" ... (+{len(miss_disc)-10} more)" if len(miss_disc) > 10 else ""))
 
+    if template is not None:
+        print(header_fix.summary_line(root, fixes, dry_run), file=sys.stderr if fmt == "sarif" else sys.stdout)
+
     # CI gating
-    exit_fail = False
-    if strict:
-        def any_missing(d: Dict[str, bool]) -> bool: return any(not ok for ok in d.values())
-        wants_headers = strict in ("all", "headers")
-        wants_ids     = strict in ("all", "ids")
-        wants_assets  = strict in ("all", "assets")
-        if wants_headers and headers_missing: exit_fail = True
-        if wants_ids     and dup_counts:      exit_fail = True
-        if wants_assets  and (any_missing(required_status) or any_missing(discovered_status)): exit_fail = True
+    exit_fail = _strict_failed(report, strict)
 
+    # Keep stdout pure SARIF for annotators; the verdict goes to stderr
+    verdict_stream = sys.stderr if fmt == "sarif" else sys.stdout
     if exit_fail:
-        print("\n❌ LEEWAY AUDIT FAIL"); sys.exit(1)
+        print("\n❌ LEEWAY AUDIT FAIL", file=verdict_stream); sys.exit(1)
     else:
-        print("\n✅ LEEWAY AUDIT PASS")
+        print("\n✅ LEEWAY AUDIT PASS", file=verdict_stream)
 
 def main():
     p = argparse.ArgumentParser(description="Leeway Frontend Audit (OS-agnostic)")
     p.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="frontend root (default: repo-relative ./frontend or env LW_FRONTEND_ROOT)")
     p.add_argument("--out", type=Path, default=DEFAULT_OUT, help="JSON report path (default: <root>/run/leeway_frontend_audit_report.json)")
-    p.add_argument("--ignore-file", type=Path, default=None, help="Path to .leewayignore (gitignore-like)")
+    p.add_argument("--ignore-file", type=Path, default=None, help="Path to .leewayignore (gitignore syntax: !negation, /anchored, dir/)")
     p.add_argument("--ignore", action="append", default=[], help="Extra ignore glob (repeatable)")
     p.add_argument("--strict", nargs="?", const="all", choices=["all","headers","ids","assets"], help="Exit non-zero if selected checks fail")
-    p.add_argument("--format", dest="format_", choices=["json","table"], default="table", help="Console output format")
+    p.add_argument("--format", dest="format_", choices=["json","table","sarif"], default="table",
+                   help="Console output format (sarif also writes <out>.sarif)")
     p.add_argument("--require-image", action="append", default=[], help="Additional required image path (relative to /public)")
-    p.add_argument("--max-header-lines", type=int, default=120, help="Only search header within first N lines (0=entire file)")
-    p.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Thread workers")
+    p.add_argument("--asset-root", action="append", default=[],
+                   help="Extra directory (relative to --root) searched for image refs after public/ (repeatable)")
+    p.add_argument("--resolve-relative", action="store_true", help="Also resolve ./ and ../ image refs against the referencing file")
+    p.add_argument("--check-case", action="store_true", help="Match asset refs case-sensitively on every host; report refs that only differ in case from a file")
+    p.add_argument("--changed-since", metavar="REF", default="",
+                   help="Only audit files changed since REF (merge-base; working tree + index + untracked, renames followed)")
+    p.add_argument("--repo-checks", action="store_true", help="With --changed-since, still check the required assets")
+    p.add_argument("--cross-file-ids", action="store_true", help="Also report element ids used by more than one file")
+    p.add_argument("--id-entry", action="append", default=[], metavar="GLOB",
+                   help="Group cross-file ids per entry file (e.g. 'src/pages/*.tsx') and what it imports; implies --cross-file-ids")
+    p.add_argument("--max-header-lines", type=int, default=DEFAULT_MAX_HEADER_LINES, help=MAX_HEADER_LINES_HELP)
+    p.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES, help=MAX_FILE_BYTES_HELP)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Pool workers (threads or processes)")
+    p.add_argument("--executor", choices=EXECUTORS, default="thread",
+                   help="thread (default), process (sharded across cores, sidesteps the GIL) or serial; reports are identical")
+    p.add_argument("--no-cache", action="store_true", help=f"Ignore and do not write <root>/run/{CACHE_NAME}")
+    p.add_argument("--quiet", action="store_true", help="Summary line only on the console (reports are still written)")
+    p.add_argument("--ndjson", type=Path, default=None, help="Also write one JSON finding per line to this path")
+    p.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event file of the audit phases")
+    p.add_argument("--fix-headers", action="store_true",
+                   help="Insert the LEEWAY header into every file flagged as missing it (atomic, in place)")
+    p.add_argument("--dry-run", action="store_true",
+                   help=f"With --fix-headers, change nothing; write the diff to <root>/run/{header_fix.DIFF_NAME}")
+    p.add_argument("--header-template", type=Path, default=None,
+                   help="Standard JSON whose \"header\" section drives --fix-headers (default: system_header_leeway_v11.json)")
+    p.add_argument("--serve", action="store_true", help="Stay resident: watch the root and answer queries on a Unix socket")
+    p.add_argument("--socket", type=Path, default=None, help="Socket path for --serve (default: <root>/run/leeway_frontend_audit.sock)")
+    p.add_argument("--poll", action="store_true", help="With --serve, use stat polling instead of inotify")
     args = p.parse_args()
 
     if args.ignore_file is None:
         args.ignore.extend(DEFAULT_IGNORES)
 
+    if args.serve:
+        import leeway_audit_daemon as daemon  # only the resident mode pays for this import
+        root = args.root.resolve()
+        state = daemon.AuditState(
+            root, load_ignore_patterns(args.ignore_file.resolve() if args.ignore_file else None, args.ignore),
+            args.require_image, int(args.max_header_lines), int(args.max_file_bytes),
+            DEFAULT_ASSET_ROOTS + args.asset_root, args.resolve_relative, args.check_case,
+            args.cross_file_ids, args.id_entry,
+        )
+        daemon.serve(state, (args.socket or root / "run" / daemon.SOCKET_NAME).resolve(),
+                     force_poll=args.poll, workers=int(args.workers), executor=args.executor)
+        return
+
     run(
         root=args.root.resolve(),
         out=args.out.resolve(),
@@ -228,6 +861,22 @@ def main():
         require_images=args.require_image,
         max_header_lines=int(args.max_header_lines),
         workers=int(args.workers),
+        use_cache=not args.no_cache,
+        executor=args.executor,
+        max_file_bytes=int(args.max_file_bytes),
+        quiet=args.quiet,
+        ndjson=args.ndjson.resolve() if args.ndjson else None,
+        trace=args.trace.resolve() if args.trace else None,
+        asset_roots=DEFAULT_ASSET_ROOTS + args.asset_root,
+        resolve_relative=args.resolve_relative,
+        check_case=args.check_case,
+        changed_since=args.changed_since,
+        repo_checks=args.repo_checks,
+        cross_file_ids=args.cross_file_ids,
+        id_entries=args.id_entry,
+        fix_headers=args.fix_headers,
+        dry_run=args.dry_run,
+        header_template=args.header_template.resolve() if args.header_template else None,
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.GIT.V1
+5WH: WHAT=Changed-file set (working tree + index + untracked, renames followed) against a git ref, and batched
+base-version reads; WHY=PR audits that scale with the diff, not the repo; WHO=RapidWebDevelop;
+WHERE=tools/leeway_git.py; WHEN=2025-10-04; HOW=python tools/leeway_frontend_audit.py --changed-since origin/main
+SPDX-License-Identifier: MIT
+"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class GitError(RuntimeError):
+    pass
+
+@dataclass
+class ChangedFile:
+    path: Path                # absolute, where the file is now
+    base_rel: Optional[str]   # repo-relative path at the base commit; None if the file is new
+
+@dataclass
+class ChangeSet:
+    ref: str
+    base: str                 # commit the diff is taken against (merge-base of ref and HEAD when there is one)
+    top: Path                 # repository top level
+    files: List[ChangedFile]
+
+    def under(self, root: Path) -> List[ChangedFile]:
+        root = root.resolve()
+        return [f for f in self.files if f.path == root or root in f.path.parents]
+
+def _git(top: Path, *args: str, stdin: Optional[bytes] = None) -> bytes:
+    try:
+        res = subprocess.run(["git", "-C", str(top), *args], input=stdin, capture_output=True, check=False)
+    except OSError as e:
+        raise GitError(f"git not available: {e}") from e
+    if res.returncode != 0:
+        raise GitError(f"git {' '.join(args[:2])} failed: {res.stderr.decode('utf-8', 'replace').strip()}")
+    return res.stdout
+
+def changed_files(root: Path, ref: str) -> ChangeSet:
+    """
+    Files added, modified, renamed or copied since `ref`, as the working tree has them now
+    (committed, staged and unstaged edits alike), plus untracked files that are not gitignored.
+    Deleted files are left out. Like `git diff ref...`, the base is the merge-base with HEAD.
+    """
+    top = Path(_git(root, "rev-parse", "--show-toplevel").decode("utf-8").strip()).resolve()
+    try: base = _git(top, "merge-base", ref, "HEAD").decode().strip()
+    except GitError: base = _git(top, "rev-parse", "--verify", f"{ref}^{{commit}}").decode().strip()
+
+    out = _git(top, "diff", "--name-status", "-z", "-M", "--no-ext-diff", base, "--").split(b"\0")
+    files: List[ChangedFile] = []
+    i = 0
+    while i < len(out) and out[i]:
+        status = out[i].decode()
+        if status[0] in "RC":
+            old, new = out[i + 1].decode("utf-8", "surrogateescape"), out[i + 2].decode("utf-8", "surrogateescape")
+            files.append(ChangedFile(top / new, old)); i += 3
+            continue
+        rel = out[i + 1].decode("utf-8", "surrogateescape"); i += 2
+        if status[0] == "D": continue
+        files.append(ChangedFile(top / rel, None if status[0] == "A" else rel))
+    for rel in _git(top, "ls-files", "--others", "--exclude-standard", "-z").split(b"\0"):
+        if rel: files.append(ChangedFile(top / rel.decode("utf-8", "surrogateescape"), None))
+    files = [f for f in files if f.path.is_file()]
+    files.sort(key=lambda f: str(f.path))
+    return ChangeSet(ref, base, top, files)
+
+def base_contents(changes: ChangeSet, files: List[ChangedFile]) -> Dict[str, bytes]:
+    """Base-commit bytes of each file that existed there, keyed by str(path); one `git cat-file` process."""
+    wanted = [f for f in files if f.base_rel is not None]
+    if not wanted: return {}
+    blob = _git(changes.top, "cat-file", "--batch",
+                stdin="".join(f"{changes.base}:{f.base_rel}\n" for f in wanted).encode("utf-8", "surrogateescape"))
+    out: Dict[str, bytes] = {}
+    pos = 0
+    for f in wanted:
+        nl = blob.index(b"\n", pos)
+        head = blob[pos:nl]
+        pos = nl + 1
+        if head.endswith((b" missing", b" ambiguous")): continue
+        size = int(head.rsplit(b" ", 1)[1])
+        out[str(f.path)] = blob[pos:pos + size]
+        pos += size + 1
+    return out
@@ -0,0 +1,176 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.HEADERFIX.V1
+5WH: WHAT=Insert the templated LEEWAY header into the files an audit flagged (parallel, atomic rename,
+encoding/BOM/newline preserving, --dry-run unified diff); WHY=replace the one-file-at-a-time PowerShell fixers
+in CI; WHO=RapidWebDevelop; WHERE=tools/leeway_header_fix.py; WHEN=2025-10-04;
+HOW=python tools/leeway_frontend_audit.py --fix-headers [--dry-run]
+SPDX-License-Identifier: MIT
+"""
+
+import difflib, json, os, re, stat, tempfile
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from leeway_headers import DEFAULT_MAX_HEADER_LINES, has_header, looks_binary
+
+DEFAULT_TEMPLATE = Path(__file__).resolve().parent / "system_header_leeway_v11.json"
+DIFF_NAME = "leeway_header_fix.diff"  # --dry-run output, lives in <root>/run/
+FIX_CHUNK = 64
+BOM = b"\xef\xbb\xbf"
+FIELD_RE = re.compile(r"\{([A-Z_]+)\}")
+# Lines that must stay first: a shebang, and in Python an encoding cookie (PEP 263: line 1 or 2)
+SHEBANG_RE = re.compile(rb"#![^\r\n]*(?:\r\n|\n|\r)?")
+CODING_RE = re.compile(rb"(?:[^\r\n]*(?:\r\n|\n|\r))?[ \t\f]*#[^\r\n]*coding[:=][^\r\n]*(?:\r\n|\n|\r)?")
+# ...and in Markdown, YAML front matter (Jekyll/Hugo/MDX only parse it at byte 0)
+FRONT_MATTER_RE = re.compile(rb"---[ \t]*(?:\r\n|\n|\r)(?:[^\r\n]*(?:\r\n|\n|\r))*?(?:---|\.\.\.)[ \t]*(?:\r\n|\n|\r|$)")
+MARKDOWN_EXTS = (".md", ".markdown", ".mdx")
+
+@dataclass
+class HeaderTemplate:
+    lines: List[str]
+    comment_styles: Dict[str, Dict[str, str]]  # ext (or "*") -> {"prefix"} or {"open", "close"}
+    defaults: Dict[str, str]
+    when: str
+
+    @classmethod
+    def load(cls, fp: Optional[Path], audit: str) -> "HeaderTemplate":
+        """The "header" section of the LEEWAY standard JSON; `audit` picks the defaults ("frontend"/"backend")."""
+        fp = fp or DEFAULT_TEMPLATE
+        try: spec = json.loads(fp.read_text(encoding="utf-8"))["header"]
+        except (OSError, ValueError, KeyError) as e: raise ValueError(f"{fp}: no usable \"header\" section ({e})") from e
+        return cls(list(spec["template"]), dict(spec["comment_styles"]), dict(spec["defaults"].get(audit) or {}),
+                   date.today().isoformat())
+
+    def render(self, rel: str) -> str:
+        """Comment block (LF newlines, no trailing newline) for root-relative POSIX path `rel`."""
+        fields = {"NAME": rel.rsplit("/", 1)[-1], "WHERE": rel, "WHEN": self.when}
+        fill = lambda s: FIELD_RE.sub(lambda m: fields.get(m[1], m[0]), s)
+        fields = {**{k: fill(v) for k, v in self.defaults.items()}, **fields}
+        body = [fill(ln) for ln in self.lines]
+        ext = "." + rel.rsplit(".", 1)[-1].lower() if "." in rel.rsplit("/", 1)[-1] else ""
+        style = self.comment_styles.get(ext) or self.comment_styles["*"]
+        if "prefix" in style: return "\n".join(style["prefix"] + ln for ln in body)
+        return "\n".join([style["open"], *body, style["close"]])
+
+@dataclass
+class HeaderFix:
+    path: str
+    action: str      # "fixed", "would-fix" (dry run) or "skipped"
+    reason: str = ""
+    diff: str = ""   # unified diff of the change (dry run only)
+
+def _newline(data: bytes) -> bytes:
+    # The file's own line ending, judged by its first line break
+    i = data.find(b"\n")
+    if i > 0 and data[i - 1:i] == b"\r": return b"\r\n"
+    if i < 0 and b"\r" in data: return b"\r"
+    return b"\n"
+
+def _preamble(body: bytes, ext: str) -> int:
+    m = SHEBANG_RE.match(body)
+    end = m.end() if m else 0
+    if ext == ".py":
+        m = CODING_RE.match(body)
+        if m: end = max(end, m.end())
+    elif ext in MARKDOWN_EXTS:
+        m = FRONT_MATTER_RE.match(body)
+        if m: end = m.end()
+    return end
+
+def _fix_one(path: str, root: Path, template: HeaderTemplate, dry_run: bool, max_header_lines: int) -> HeaderFix:
+    p = Path(path)
+    try:
+        if p.is_symlink(): return HeaderFix(path, "skipped", "symlink")
+        with open(p, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            data = fh.read()
+    except OSError as e: return HeaderFix(path, "skipped", f"unreadable ({e.strerror})")
+    if looks_binary(data): return HeaderFix(path, "skipped", "binary")
+    bom = BOM if data.startswith(BOM) else b""
+    body = data[len(bom):]
+    try: text, enc = body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError: text, enc = body.decode("latin-1"), "ascii"  # unknown 8-bit: only ASCII is safe to add
+    end = _preamble(body, p.suffix.lower())
+    # A header we put after long front matter can sit past max_header_lines: look from there too
+    for rest in (text, body[end:].decode("utf-8" if enc == "utf-8" else "latin-1")) if end else (text,):
+        if has_header(rest.replace("\r\n", "\n").replace("\r", "\n"), max_header_lines):
+            return HeaderFix(path, "skipped", "header present")
+
+    try: rel = p.relative_to(root).as_posix()
+    except ValueError: rel = p.name
+    nl = _newline(body)
+    block = template.render(rel)
+    try: head = (block.replace("\n", nl.decode()) + nl.decode() * 2).encode(enc)
+    except UnicodeEncodeError: return HeaderFix(path, "skipped", "not UTF-8 and the header is not ASCII")
+    pre = body[:end]
+    if pre and not pre.endswith((b"\n", b"\r")): pre += nl
+    new = bom + pre + head + body[end:]
+
+    if dry_run:
+        # Insertion at the top: diffing the first few lines gives the same hunk as the whole file
+        old_lines = text.splitlines()[:len(pre.splitlines()) + 3]
+        new_lines = new[len(bom):].decode("utf-8" if enc == "utf-8" else "latin-1").splitlines()[:len(old_lines) + block.count("\n") + 2]
+        diff = "\n".join(difflib.unified_diff(old_lines, new_lines, f"a/{rel}", f"b/{rel}", lineterm=""))
+        return HeaderFix(path, "would-fix", diff=diff + "\n")
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{p.name}.", suffix=".lwfix", dir=p.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(new); fh.flush(); os.fsync(fh.fileno())
+        os.chmod(tmp, stat.S_IMODE(st.st_mode))
+        now = os.stat(p)
+        if (now.st_size, now.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+            os.unlink(tmp); return HeaderFix(path, "skipped", "changed while fixing")
+        os.replace(tmp, p)
+    except OSError as e:
+        try: os.unlink(tmp)
+        except OSError: pass
+        return HeaderFix(path, "skipped", f"write failed ({e.strerror})")
+    return HeaderFix(path, "fixed")
+
+def _fix_chunk(paths: List[str], root: Path, template: HeaderTemplate, dry_run: bool, max_header_lines: int) -> List[HeaderFix]:
+    # Top-level so ProcessPoolExecutor can pickle it
+    return [_fix_one(p, root, template, dry_run, max_header_lines) for p in paths]
+
+def fix_headers(root: Path, paths: List[str], template: HeaderTemplate, dry_run: bool = False,
+                workers: int = os.cpu_count() or 4, pool: Optional[Executor] = None,
+                max_header_lines: int = DEFAULT_MAX_HEADER_LINES) -> List[HeaderFix]:
+    """
+    Header-less files from an audit's `headers_missing` (no second walk) get `template` prepended,
+    after any shebang/encoding line or Markdown front matter, in the file's own encoding, BOM and line endings.
+    Each write goes to a temp file in the same directory and is renamed over the original, so a
+    reader never sees half a file; a file modified since it was read is left alone.
+    Every file is re-checked first, so running the fixer twice changes nothing the second time.
+    """
+    fix = partial(_fix_chunk, root=root, template=template, dry_run=dry_run, max_header_lines=max_header_lines)
+    chunks = [paths[i:i + FIX_CHUNK] for i in range(0, len(paths), FIX_CHUNK)]
+    if len(chunks) <= 1: return [r for c in chunks for r in fix(c)]
+    if pool is not None: return [r for batch in pool.map(fix, chunks) for r in batch]
+    with ThreadPoolExecutor(max_workers=max(2, workers)) as ex:
+        return [r for batch in ex.map(fix, chunks) for r in batch]
+
+def write_diff(fp: Path, fixes: List[HeaderFix]):
+    """Concatenated dry-run diffs, with root-relative a/ and b/ paths as `git diff` prints them."""
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    with open(fp, "w", encoding="utf-8", newline="\n") as fh:
+        for f in fixes:
+            if f.diff: fh.write(f.diff)
+
+def summary(fixes: List[HeaderFix]) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for f in fixes: out[f.action] = out.get(f.action, 0) + 1
+    return dict(sorted(out.items()))
+
+def summary_line(root: Path, fixes: List[HeaderFix], dry_run: bool) -> str:
+    done = ", ".join(f"{n} {k}" for k, n in summary(fixes).items()) or "nothing to fix"
+    return (f"header fix{' (dry run)' if dry_run else ''} [{root}]: {done}"
+            + (f"; diff: {root / 'run' / DIFF_NAME}" if dry_run else ""))
+
+def outcomes(fixes: List[HeaderFix]) -> Dict[str, str]:
+    """path -> "fixed" / "would-fix" / "skipped: <reason>", as stored in a report's header_fixes."""
+    return {f.path: f.action + (f": {f.reason}" if f.reason else "") for f in fixes}
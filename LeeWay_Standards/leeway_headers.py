@@ -0,0 +1,70 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.HEADERS.V1
+5WH: WHAT=LEEWAY header detection on bounded file prefixes + binary/oversize guards shared by both audits;
+WHY=cap memory and I/O per file regardless of file size; WHO=RapidWebDevelop;
+WHERE=tools/leeway_headers.py; WHEN=2025-10-04; HOW=from leeway_headers import probe_header
+SPDX-License-Identifier: MIT
+"""
+
+import re
+from pathlib import Path
+from typing import Tuple
+
+HEADER_RE = re.compile(r"LEEWAY HEADER|LEEWAY MICRO:", re.M)
+HEADER_RE_B = re.compile(HEADER_RE.pattern.encode("ascii"), re.M)  # ASCII-only, so bytes == decoded match
+
+DEFAULT_MAX_HEADER_LINES = 120
+DEFAULT_MAX_FILE_BYTES = 16 * 1024 * 1024
+SNIFF_BYTES = 8192
+READ_CHUNK = 64 * 1024
+_OVERLAP = 16  # > longest HEADER_RE literal, so a match split across chunks is still found
+
+MAX_HEADER_LINES_HELP = "Only search header within first N lines (0=entire file)"
+MAX_FILE_BYTES_HELP = "Skip (and report) files larger than N bytes (0=no limit)"
+
+def looks_binary(head: bytes) -> bool:
+    # Same heuristic as git/grep: a NUL byte in the first block
+    return b"\0" in head[:SNIFF_BYTES]
+
+def oversize_reason(size: int, max_file_bytes: int) -> str:
+    return f"oversize ({size} > {max_file_bytes} bytes)" if max_file_bytes and size > max_file_bytes else ""
+
+def header_end(text: str, max_lines: int) -> int:
+    """Offset of the `max_lines`-th newline (i.e. end of the first N lines), or len(text)."""
+    if max_lines <= 0: return len(text)
+    pos = -1
+    for _ in range(max_lines):
+        pos = text.find("\n", pos + 1)
+        if pos < 0: return len(text)
+    return pos
+
+def has_header(text: str, max_lines: int) -> bool:
+    """Header check on an already-decoded buffer, without splitting it into lines."""
+    return HEADER_RE.search(text, 0, header_end(text, max_lines)) is not None
+
+def probe_header(path: Path, max_lines: int) -> Tuple[str, bytes]:
+    """
+    Stream the file prefix in chunks and stop at the first header match or after `max_lines` lines.
+    Returns (status, consumed) where status is "present", "missing" or "binary" and `consumed`
+    is the byte prefix the verdict depends on (suitable for a cache fingerprint).
+    """
+    with open(path, "rb") as fh:
+        buf = bytearray(fh.read(SNIFF_BYTES))
+        if looks_binary(buf): return "binary", bytes(buf)
+        searched, nl_pos, nl_seen = 0, -1, 0
+        while True:
+            end = len(buf)
+            if max_lines > 0:
+                while nl_seen < max_lines:
+                    nxt = buf.find(b"\n", nl_pos + 1)
+                    if nxt < 0: break
+                    nl_pos, nl_seen = nxt, nl_seen + 1
+                if nl_seen >= max_lines: end = nl_pos
+            if HEADER_RE_B.search(buf, max(0, searched - _OVERLAP), end):
+                return "present", bytes(buf[:end])
+            if end < len(buf): return "missing", bytes(buf[:end])
+            searched = end
+            chunk = fh.read(READ_CHUNK)
+            if not chunk: return "missing", bytes(buf)
+            buf += chunk
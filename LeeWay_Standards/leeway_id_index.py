@@ -0,0 +1,121 @@
+"""
+LEEWAY HEADER
+REGION: FRONTEND.AUDIT.IDINDEX.V1
+5WH: WHAT=Repository-wide DOM id index (interned ids, per-file typed arrays) with cross-file collisions,
+optionally grouped per entry point through the relative-import graph; WHY=two components rendering the same
+id on one page is the real bug, and per-file checks cannot see it; WHO=RapidWebDevelop;
+WHERE=tools/leeway_id_index.py; WHEN=2025-10-04; HOW=python tools/leeway_frontend_audit.py --cross-file-ids [--id-entry "src/pages/*.tsx"]
+SPDX-License-Identifier: MIT
+"""
+
+import posixpath, sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from leeway_walk import IgnoreMatcher
+
+RESOLVE_EXTS = (".tsx", ".ts", ".jsx", ".js", ".mjs")
+
+class IdIndex:
+    """
+    Built incrementally with `add()` as scans stream in. Each id string is stored once (interned) and
+    numbered; a file costs three arrays: id numbers, the concatenated line numbers of those ids, and
+    offsets into the lines. Ids seen in two or more files are tracked as they arrive, so repo-wide
+    collisions need no second pass over the whole index.
+    """
+
+    def __init__(self):
+        self._num: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.paths: List[str] = []
+        self._file_no: Dict[str, int] = {}
+        self._first = array("i")        # id number -> first file number it was seen in
+        self._multi: Set[int] = set()   # id numbers present in 2+ files
+        self._ids: List[array] = []     # file number -> id numbers
+        self._offs: List[array] = []    # file number -> start of each id's lines in _lines (+ end)
+        self._lines: List[array] = []   # file number -> line numbers, grouped per id
+        self._imports: List[tuple] = []  # file number -> relative import specifiers
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._file_no
+
+    def add(self, path: str, ids: Dict[str, List[int]], imports: Iterable[str] = ()):
+        if path in self._file_no: raise ValueError(f"{path} already indexed")
+        f = len(self.paths)
+        self._file_no[path] = f
+        self.paths.append(path)
+        nums, offs, lines = array("I"), array("I", [0]), array("I")
+        for name, where in ids.items():
+            k = self._num.get(name)
+            if k is None:
+                k = self._num[sys.intern(name)] = len(self.names)
+                self.names.append(name)
+                self._first.append(f)
+            elif self._first[k] != f:
+                self._multi.add(k)
+            nums.append(k); lines.extend(where); offs.append(len(lines))
+        self._ids.append(nums); self._offs.append(offs); self._lines.append(lines)
+        self._imports.append(tuple(imports))
+
+    def entry(self, path: str) -> Tuple[Dict[str, List[int]], tuple]:
+        """(ids, imports) of one file as given to `add()`, e.g. to carry it over into a rebuilt index."""
+        f = self._file_no[path]
+        nums, offs, lines = self._ids[f], self._offs[f], self._lines[f]
+        return {self.names[k]: lines[offs[i]:offs[i + 1]].tolist() for i, k in enumerate(nums)}, self._imports[f]
+
+    def collisions(self, files: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, List[int]]]:
+        """id -> {path: [lines]} for ids present in 2+ of `files` (default: every indexed file)."""
+        if files is None:
+            wanted, scope = self._multi, range(len(self.paths))
+        else:
+            scope = sorted(set(files))
+            seen: Dict[int, int] = {}
+            wanted = set()
+            for f in scope:
+                for k in self._ids[f]:
+                    if seen.setdefault(k, f) != f: wanted.add(k)
+        out: Dict[str, Dict[str, List[int]]] = {}
+        if not wanted: return out
+        for f in scope:
+            nums, offs, lines = self._ids[f], self._offs[f], self._lines[f]
+            for i, k in enumerate(nums):
+                if k in wanted:
+                    out.setdefault(self.names[k], {})[self.paths[f]] = lines[offs[i]:offs[i + 1]].tolist()
+        return {k: dict(sorted(v.items())) for k, v in sorted(out.items())}
+
+    def _resolve(self, f: int, spec: str) -> Optional[int]:
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(Path(self.paths[f]).as_posix()), spec))
+        for cand in (base, *(base + e for e in RESOLVE_EXTS), *(f"{base}/index{e}" for e in RESOLVE_EXTS)):
+            n = self._file_no.get(str(Path(cand)))
+            if n is not None: return n
+        return None
+
+    def closure(self, f: int) -> Set[int]:
+        """Files reachable from file number `f` through relative imports (itself included)."""
+        seen, stack = {f}, [f]
+        while stack:
+            cur = stack.pop()
+            for spec in self._imports[cur]:
+                n = self._resolve(cur, spec)
+                if n is not None and n not in seen: seen.add(n); stack.append(n)
+        return seen
+
+    def collisions_by_entry(self, root: Path, entry_patterns: List[str]) -> Dict[str, Dict[str, Dict[str, List[int]]]]:
+        """entry path -> collisions among the files that entry pulls in; entries match gitignore-style globs."""
+        matcher = IgnoreMatcher(entry_patterns)
+        out: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+        for f, path in enumerate(self.paths):
+            try: rel = Path(path).relative_to(root).as_posix()
+            except ValueError: continue
+            if not matcher.ignored_path(rel): continue
+            hits = self.collisions(self.closure(f))
+            if hits: out[path] = hits
+        return dict(sorted(out.items()))
+
+    def stats(self) -> Dict[str, int]:
+        return {"id_files": len(self.paths), "ids_interned": len(self.names), "ids_multi_file": len(self._multi),
+                "id_occurrences": sum(len(x) for x in self._lines)}
@@ -0,0 +1,80 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.METRICS.V1
+5WH: WHAT=Per-phase wall/CPU timings, counters and slowest files for the LeeWay audits; Chrome trace export;
+WHY=see where a slow CI run spent its time without attaching a profiler; WHO=RapidWebDevelop;
+WHERE=tools/leeway_metrics.py; WHEN=2025-10-04; HOW=report["metrics"]; --trace run/trace.json (chrome://tracing, Perfetto)
+SPDX-License-Identifier: MIT
+"""
+
+import heapq, os, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from leeway_report_io import write_json
+
+class Metrics:
+    """
+    Collector for one audit run. Phases record wall time (perf_counter) and process CPU time
+    (process_time: every thread of this process, not pool subprocesses). `worker_seconds` sums
+    per-file time spent inside workers, so it can exceed wall time when the pool is parallel.
+    """
+
+    def __init__(self, name: str, top_files: int = 10):
+        self.name = name
+        self.top_files = top_files
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.worker_seconds: Dict[str, float] = {}
+        self._slow: List[Tuple[float, str]] = []  # min-heap of the `top_files` slowest
+        self._events: List[dict] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tid = threading.get_ident()
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - w0, time.process_time() - c0
+            agg = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+            agg["wall_s"] += wall; agg["cpu_s"] += cpu; agg["calls"] += 1
+            self._events.append({"name": name, "cat": self.name, "ph": "X", "ts": w0 * 1e6, "dur": wall * 1e6,
+                                 "pid": os.getpid(), "tid": tid, "args": {"cpu_ms": round(cpu * 1e3, 3)}})
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_worker_time(self, name: str, seconds: float):
+        self.worker_seconds[name] = self.worker_seconds.get(name, 0.0) + seconds
+
+    def file_time(self, path: str, seconds: float):
+        if self.top_files <= 0: return
+        if len(self._slow) < self.top_files: heapq.heappush(self._slow, (seconds, path))
+        elif seconds > self._slow[0][0]: heapq.heapreplace(self._slow, (seconds, path))
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": {k: {"wall_s": round(v["wall_s"], 6), "cpu_s": round(v["cpu_s"], 6), "calls": v["calls"]}
+                       for k, v in self.phases.items()},
+            "counters": dict(sorted(self.counters.items())),
+            "worker_seconds": {k: round(v, 6) for k, v in sorted(self.worker_seconds.items())},
+            "slowest_files": [{"path": p, "seconds": round(s, 6)} for s, p in sorted(self._slow, reverse=True)],
+        }
+
+    def trace_events(self) -> List[dict]:
+        events = list(self._events)
+        pid = os.getpid()
+        for tid in {e["tid"] for e in self._events}:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": self.name}})
+        if self._events:
+            end = max(e["ts"] + e["dur"] for e in self._events)
+            events.append({"name": f"{self.name} counters", "ph": "C", "ts": end, "pid": pid,
+                           "tid": self._events[0]["tid"], "args": dict(self.counters)})
+        return events
+
+def write_trace(fp: Path, *metrics: Metrics):
+    """Chrome trace-event JSON (object form) for one or more collectors; open in chrome://tracing or Perfetto."""
+    events = [e for m in metrics for e in m.trace_events()]
+    write_json(fp, {"traceEvents": events, "displayTimeUnit": "ms"}, indent=None)
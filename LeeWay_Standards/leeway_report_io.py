@@ -0,0 +1,39 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.REPORT_IO.V1
+5WH: WHAT=Streaming JSON / NDJSON writers shared by the LeeWay audits; WHY=flat memory and fast CI logs
+with 100k+ findings (no giant transient strings); WHO=RapidWebDevelop;
+WHERE=tools/leeway_report_io.py; WHEN=2025-10-04; HOW=from leeway_report_io import write_json, write_ndjson
+SPDX-License-Identifier: MIT
+"""
+
+import json, sys
+from pathlib import Path
+from typing import IO, Iterable, Optional
+
+def write_json(fp: Path, obj, indent: Optional[int] = 2):
+    """json.dump streams encoder chunks into the file; nothing builds the whole document as one str."""
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    with open(fp, "w", encoding="utf-8") as fh:
+        json.dump(obj, fh, indent=indent)
+
+def write_ndjson(fp: Path, records: Iterable[dict], append: bool = False) -> int:
+    """One compact JSON object per line; `records` may be a generator. -> number of lines written."""
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with open(fp, "a" if append else "w", encoding="utf-8", newline="\n") as fh:
+        for rec in records:
+            fh.write(json.dumps(rec, separators=(",", ":"), ensure_ascii=False))
+            fh.write("\n")
+            n += 1
+    return n
+
+def copy_to_stream(fp: Path, stream: IO[str] = None, chunk: int = 1 << 16):
+    """Echo a written report to the console in chunks instead of re-reading it into one string."""
+    stream = stream or sys.stdout
+    with open(fp, "r", encoding="utf-8") as fh:
+        while True:
+            buf = fh.read(chunk)
+            if not buf: break
+            stream.write(buf)
+    stream.write("\n")
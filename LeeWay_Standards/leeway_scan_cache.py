@@ -0,0 +1,84 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.CACHE.V1
+5WH: WHAT=Persistent incremental per-file scan cache shared by the LeeWay audits; WHY=warm reruns skip unchanged files;
+WHO=RapidWebDevelop; WHERE=tools/leeway_scan_cache.py; WHEN=2025-10-04; HOW=from leeway_scan_cache import ScanCache
+SPDX-License-Identifier: MIT
+"""
+
+import hashlib, json, os
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_VERSION = 1
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def cache_signature(*parts) -> str:
+    """Hash of everything that shapes per-file results (regexes, config, version)."""
+    blob = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+class ScanCache:
+    """
+    On-disk map of path -> {size, mtime_ns, fp, result}.
+
+    - `lookup()` is a stat-only hit (no read) when size + mtime_ns match.
+    - `prior()` returns the old entry so a worker can compare content fingerprints
+      when only the mtime moved (checkout, touch) and skip re-scanning.
+    - `save()` keeps only entries stored during this run, so deleted/ignored
+      files are evicted automatically. With `prune=False` (partial runs that
+      only touch some files) untouched entries are kept as well.
+    """
+
+    def __init__(self, path: Optional[Path], signature: str, prune: bool = True):
+        self.path = path
+        self.signature = signature
+        self.prune = prune
+        self.entries: Dict[str, dict] = {}
+        self.fresh: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Optional[Path], signature: str, prune: bool = True) -> "ScanCache":
+        cache = cls(path, signature, prune)
+        if not path: return cache
+        try: blob = json.loads(path.read_text(encoding="utf-8"))
+        except Exception: return cache
+        if isinstance(blob, dict) and blob.get("signature") == signature:
+            cache.entries = blob.get("entries") or {}
+        return cache
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def lookup(self, key: str, st: os.stat_result) -> Optional[dict]:
+        if not self.enabled: return None
+        ent = self.entries.get(key)
+        if ent and ent.get("size") == st.st_size and ent.get("mtime_ns") == st.st_mtime_ns:
+            self.hits += 1
+            self.fresh[key] = ent
+            return ent["result"]
+        self.misses += 1
+        return None
+
+    def prior(self, key: str) -> Optional[dict]:
+        return self.entries.get(key) if self.enabled else None
+
+    def store(self, key: str, size: int, mtime_ns: int, fp: str, result: dict):
+        if not self.enabled or not fp: return
+        self.fresh[key] = {"size": size, "mtime_ns": mtime_ns, "fp": fp, "result": result}
+
+    def save(self):
+        if not self.enabled: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        entries = self.fresh if self.prune else {**self.entries, **self.fresh}
+        tmp.write_text(json.dumps({"signature": self.signature, "entries": entries}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.fresh)}
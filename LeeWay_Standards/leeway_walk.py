@@ -0,0 +1,239 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.WALK.V1
+5WH: WHAT=Pruning os.scandir walker + compiled gitignore-style matcher for the LeeWay audits;
+WHY=never descend into node_modules/dist/.next; one regex instead of N Path.match calls per file;
+WHO=RapidWebDevelop; WHERE=tools/leeway_walk.py; WHEN=2025-10-04; HOW=from leeway_walk import IgnoreMatcher, Inventory, walk_files
+SPDX-License-Identifier: MIT
+"""
+
+import os, re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+def load_ignore_patterns(ignore_file: Optional[Path], inline_ignores: List[str]) -> List[str]:
+    pats: List[str] = []
+    if ignore_file and ignore_file.exists():
+        pats += [ln.strip() for ln in ignore_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+                 if ln.strip() and not ln.strip().startswith("#")]
+    pats += inline_ignores or []
+    return pats
+
+def _translate_class(seg: str, i: int) -> Tuple[Optional[str], int]:
+    """
+    `seg[i]` is "[" -> (regex class, index of the closing "]"), or (None, i) when unterminated.
+    A "]" right after "[" / "[!" is a literal, as in fnmatch; "\\x" is a literal x. A class
+    that still is not a valid regex (e.g. a reversed range) matches its text literally.
+    """
+    n = len(seg)
+    j = i + 1
+    neg = j < n and seg[j] in "!^"
+    if neg: j += 1
+    body: List[str] = []
+    while j < n and (seg[j] != "]" or not body):
+        ch, esc = seg[j], seg[j] == "\\" and j + 1 < n
+        if esc: j += 1; ch = seg[j]
+        body.append("-" if ch == "-" and not esc else re.escape(ch)); j += 1
+    if j >= n: return None, i
+    cls = "[" + ("^/" if neg else "") + "".join(body) + "]"  # like * and ?, a class never matches "/"
+    try: re.compile(cls)
+    except re.error: cls = re.escape(seg[i:j + 1])
+    return cls, j
+
+def _translate_segment(seg: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(seg)
+    while i < n:
+        c = seg[i]
+        if c == "\\" and i + 1 < n:
+            out.append(re.escape(seg[i + 1])); i += 2; continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            cls, j = _translate_class(seg, i)
+            if cls is None:
+                out.append(re.escape(c))  # unterminated: a literal "[", as fnmatch does
+            else:
+                out.append(cls); i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def _translate(pat: str, prune_globstar: bool) -> str:
+    """
+    gitignore glob -> regex over a root-relative POSIX path.
+    A slash at the start or in the middle anchors the rule to the root; otherwise it
+    matches at any depth. With `prune_globstar`, `dir/**` also matches `dir` itself so
+    the walker can skip it (only safe when no negation could re-include a child).
+    """
+    anchored = "/" in pat
+    parts = pat.lstrip("/").split("/")
+    rx = "" if anchored else "(?:.*/)?"
+    last = len(parts) - 1
+    for i, part in enumerate(parts):
+        if part == "**":
+            if i == last:
+                rx = ".*" if i == 0 else rx[:-1] + ("(?:/.*)?" if prune_globstar else "/.*")
+            else:
+                rx += "(?:.*/)?"
+            continue
+        rx += _translate_segment(part) + ("" if i == last else "/")
+    return rx
+
+class IgnoreMatcher:
+    """
+    Patterns compiled once, gitignore semantics:
+      `!pat` re-includes, `pat/` matches directories only, leading or inner `/` anchors
+      to the root, `*`/`?`/`[..]` stop at `/`, `**` spans directories, last match wins.
+    Rules are joined into one alternation in reverse order with a named group per
+    rule, so the first alternative that matches is the last rule in file order.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        rules: List[Tuple[str, bool, bool]] = []
+        for raw in patterns:
+            pat = raw.rstrip("\n").rstrip()
+            if not pat or pat.startswith("#"): continue
+            negate = pat.startswith("!")
+            if negate: pat = pat[1:]
+            elif pat.startswith("\\!") or pat.startswith("\\#"): pat = pat[1:]
+            dir_only = pat.endswith("/")
+            pat = pat.rstrip("/")
+            if pat: rules.append((pat, negate, dir_only))
+        self.patterns = [("!" if neg else "") + pat + ("/" if d else "") for pat, neg, d in rules]
+        self.has_negations = any(neg for _, neg, _ in rules)
+        self._negated: Set[str] = {f"r{i}" for i, (_, neg, _) in enumerate(rules) if neg}
+        prune = not self.has_negations
+        self._dir_rx = self._compile([(i, _translate(p, prune)) for i, (p, _, _) in enumerate(rules)])
+        self._file_rx = self._compile([(i, _translate(p, False)) for i, (p, _, d) in enumerate(rules) if not d])
+
+    @staticmethod
+    def _compile(items: List[Tuple[int, str]]) -> Optional["re.Pattern[str]"]:
+        if not items: return None
+        return re.compile("|".join(f"(?P<r{i}>{rx})" for i, rx in reversed(items)), re.S)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def ignored(self, rel: str, is_dir: bool = False) -> bool:
+        """Verdict for this exact path (parents are the walker's job)."""
+        rx = self._dir_rx if is_dir else self._file_rx
+        if rx is None: return False
+        m = rx.fullmatch(rel)
+        return bool(m) and m.lastgroup not in self._negated
+
+    def ignored_path(self, rel: str, is_dir: bool = False) -> bool:
+        """Verdict for a path including every parent directory, for paths that did not come from a walk."""
+        parts = rel.split("/")
+        for i in range(1, len(parts)):
+            if self.ignored("/".join(parts[:i]), is_dir=True): return True
+        return self.ignored(rel, is_dir)
+
+def walk_files(root: Path, matcher: IgnoreMatcher, exts: Optional[Set[str]] = None, rel_prefix: str = "",
+               stats: Optional[Dict[str, int]] = None) -> List[Path]:
+    """
+    Iterative os.scandir walk that never enters ignored directories. Like Path.rglob it
+    does not recurse into symlinked directories. Returns paths sorted for deterministic reports.
+    `rel_prefix` ("sub/dir/") walks a subdirectory while matching against the original root.
+    `stats`, when given, receives dirs_walked / dirs_pruned / files_seen / files_ignored counts.
+    """
+    files: List[Path] = []
+    stack: List[Tuple[str, str]] = [(str(root), rel_prefix)]
+    walked = pruned = seen = ignored = 0
+    while stack:
+        path, rel = stack.pop()
+        try: it = os.scandir(path)
+        except OSError: continue
+        walked += 1
+        with it:
+            for e in it:
+                r = rel + e.name
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if not matcher.ignored(r, is_dir=True): stack.append((e.path, r + "/"))
+                        else: pruned += 1
+                        continue
+                    if not e.is_file(): continue
+                except OSError:
+                    continue
+                seen += 1
+                if exts is not None and os.path.splitext(e.name)[1].lower() not in exts: continue
+                if matcher.ignored(r): ignored += 1; continue
+                files.append(Path(e.path))
+    files.sort(key=str)
+    if stats is not None:
+        for k, v in (("dirs_walked", walked), ("dirs_pruned", pruned), ("files_seen", seen), ("files_ignored", ignored)):
+            stats[k] = stats.get(k, 0) + v
+    return files
+
+class Inventory:
+    """
+    One pruned walk of a tree, kept in memory so several checks can share it.
+    Ignored and symlinked directories are recorded (listings and existence checks still work)
+    but never entered; lookups below them fall back to a real stat.
+    Keys are root-relative POSIX paths; "" is the root itself.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.dirs: Set[str] = {""}
+        self.pruned: Set[str] = set()
+        self.files: Set[str] = set()
+        self.children: Dict[str, List[str]] = {}
+        self.files_ignored = 0
+
+    @classmethod
+    def build(cls, root: Path, matcher: IgnoreMatcher) -> "Inventory":
+        inv = cls(root)
+        stack: List[Tuple[str, str]] = [(str(root), "")]
+        while stack:
+            path, rel = stack.pop()
+            try: it = os.scandir(path)
+            except OSError: continue
+            names: List[str] = []
+            with it:
+                for e in it:
+                    r = rel + e.name
+                    names.append(e.name)
+                    try:
+                        if e.is_dir():
+                            inv.dirs.add(r)
+                            if e.is_symlink() or matcher.ignored(r, is_dir=True): inv.pruned.add(r)
+                            else: stack.append((e.path, r + "/"))
+                            continue
+                        if not e.is_file(): continue
+                    except OSError:
+                        continue
+                    if not matcher.ignored(r): inv.files.add(r)
+                    else: inv.files_ignored += 1
+            inv.children[rel.rstrip("/")] = sorted(names)
+        return inv
+
+    def stats(self) -> Dict[str, int]:
+        return {"dirs_walked": len(self.children), "dirs_pruned": len(self.pruned),
+                "files_seen": len(self.files) + self.files_ignored, "files_ignored": self.files_ignored}
+
+    def _path(self, rel: str) -> Path:
+        return self.root / Path(*rel.split("/"))
+
+    def _under_pruned(self, rel: str) -> bool:
+        parts = rel.split("/")
+        return any("/".join(parts[:i]) in self.pruned for i in range(1, len(parts)))
+
+    def exists(self, rel: str) -> bool:
+        if rel in self.dirs or rel in self.files: return True
+        return self._under_pruned(rel) and self._path(rel).exists()
+
+    def listdir(self, rel: str) -> Optional[List[str]]:
+        """Entry names of a directory, or None if it is missing or unreadable."""
+        if rel in self.children: return self.children[rel]
+        if rel not in self.pruned and not self._under_pruned(rel): return None
+        try: return sorted(os.listdir(self._path(rel)))
+        except OSError: return None
+
+    def files_with_ext(self, exts: Iterable[str]) -> List[Path]:
+        extset = {e.lower() for e in exts}
+        return [self._path(r) for r in sorted(self.files) if os.path.splitext(r)[1].lower() in extset]
@@ -0,0 +1,12 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.TESTS.V1
+5WH: WHAT=pytest setup for the audit tools; WHY=the tools import each other as top-level modules;
+WHO=RapidWebDevelop; WHERE=tools/tests/conftest.py; WHEN=2025-10-04; HOW=python -m pytest tools/tests
+SPDX-License-Identifier: MIT
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,46 @@
+"""
+LEEWAY HEADER
+REGION: SHARED.AUDIT.TESTS.HEADERFIX.V1
+5WH: WHAT=Header fixer placement tests; WHY=a header above a shebang, coding line or front matter breaks the file;
+WHO=RapidWebDevelop; WHERE=tools/tests/test_leeway_header_fix.py; WHEN=2025-10-04; HOW=python -m pytest tools/tests
+SPDX-License-Identifier: MIT
+"""
+
+from leeway_header_fix import HeaderTemplate, fix_headers
+
+def _fix(tmp_path, name, data, dry_run=False):
+    p = tmp_path / name
+    p.write_bytes(data)
+    template = HeaderTemplate.load(None, "frontend")
+    return p, fix_headers(tmp_path, [str(p)], template, dry_run=dry_run)
+
+def test_markdown_front_matter_stays_first(tmp_path):
+    p, fixes = _fix(tmp_path, "page.md", b"---\ntitle: x\n---\n# Hi\n")
+    assert [f.action for f in fixes] == ["fixed"]
+    out = p.read_bytes()
+    assert out.startswith(b"---\ntitle: x\n---\n<!--\nLEEWAY HEADER")
+    assert out.endswith(b"-->\n\n# Hi\n")
+
+def test_markdown_front_matter_crlf(tmp_path):
+    p, _ = _fix(tmp_path, "page.md", b"---\r\ntitle: x\r\n---\r\n# Hi\r\n")
+    out = p.read_bytes()
+    assert out.startswith(b"---\r\ntitle: x\r\n---\r\n<!--\r\n")
+    assert b"\n" not in out.replace(b"\r\n", b"")
+
+def test_markdown_without_front_matter_gets_header_at_top(tmp_path):
+    p, _ = _fix(tmp_path, "page.md", b"# Hi\n\n---\n\ntext\n")
+    assert p.read_bytes().startswith(b"<!--\nLEEWAY HEADER")
+
+def test_long_front_matter_fixed_once(tmp_path):
+    front = b"---\n" + b"".join(b"k%d: v\n" % i for i in range(40)) + b"---\n"
+    p, _ = _fix(tmp_path, "page.md", front + b"# Hi\n")
+    first = p.read_bytes()
+    _, fixes = _fix(tmp_path, "page.md", first)
+    assert [f.action for f in fixes] == ["skipped"]
+    assert p.read_bytes() == first
+
+def test_dry_run_leaves_front_matter_file_alone(tmp_path):
+    data = b"---\ntitle: x\n---\n# Hi\n"
+    p, fixes = _fix(tmp_path, "page.md", data, dry_run=True)
+    assert p.read_bytes() == data
+    assert fixes[0].action == "would-fix" and "+<!--" in fixes[0].diff